@@ -2,46 +2,101 @@ var gulp = require('gulp');
 var sass = require('gulp-sass');
 var concat = require('gulp-concat');
 var watch = require('gulp-watch');
+var uglify = require('gulp-uglify');
+var minifyCss = require('gulp-minify-css');
+var rev = require('gulp-rev');
+var gzip = require('gulp-gzip');
+var merge = require('merge-stream');
+var del = require('del');
 
 var baseSrcDir = 'tracker/static-dev';
 var baseDestDir = 'tracker/static';
+var componentsDir = baseSrcDir + '/components';
+
+// Only the Foundation plugins that the templates actually use
+var foundationModules = [
+	'foundation.js',
+	'foundation.alert.js',
+	'foundation.topbar.js'
+].map(function (module) {
+	return componentsDir + '/foundation/js/foundation/' + module;
+});
 
 gulp.task('sass', function () {
-    gulp.src(baseSrcDir + '/scss/*.scss')
-        .pipe(sass())
-        .pipe(gulp.dest(baseSrcDir + '/css'));
+	return gulp.src(baseSrcDir + '/scss/*.scss')
+		.pipe(sass())
+		.pipe(gulp.dest(baseSrcDir + '/css'));
 });
 
 gulp.task('copy-foundation-fonts', function () {
-	gulp.src(baseSrcDir + '/components/foundation-icon-fonts/foundation-icons.{ttf,woff,eof,svg}')
+	return gulp.src(componentsDir + '/foundation-icon-fonts/foundation-icons.{ttf,woff,eof,svg}')
 		.pipe(gulp.dest(baseSrcDir + '/css'));
 });
 
 gulp.task('build-styles', ['sass', 'copy-foundation-fonts'])
 
-gulp.task('concat-js', function() {
-	gulp.src([
-			baseSrcDir + '/components/fastclick/lib/fastclick.js',
-			baseSrcDir + '/components/jquery/dist/jquery.min.js',
-			baseSrcDir + '/components/foundation/js/foundation/foundation.min.js',
-			baseSrcDir + '/js/app.js'
+gulp.task('clean', function (cb) {
+	del([baseDestDir + '/js', baseDestDir + '/css', baseDestDir + '/rev-manifest.json'], cb);
+});
+
+// Assets referenced by relative URLs from inside the stylesheets. These keep
+// their names, so they are not given far-future expiry in app.yaml.
+gulp.task('copy-assets', ['clean', 'build-styles'], function () {
+	return gulp.src([
+			baseSrcDir + '/css/foundation-icons.*',
+			componentsDir + '/chosen/chosen-sprite*.png'
 		])
-		.pipe(concat('app.built.js'))
-		.pipe(gulp.dest(baseDestDir + '/js'));
+		.pipe(gulp.dest(baseDestDir + '/css'));
 });
 
+// Each bundle is named by its unfingerprinted path, which is the name that
+// templates pass to {% static_bundle %}
+gulp.task('bundle', ['clean', 'build-styles'], function () {
+	var modernizr = gulp.src(componentsDir + '/modernizr/modernizr.js')
+		.pipe(concat('js/modernizr.js'))
+		.pipe(uglify());
+
+	var app = gulp.src([
+			componentsDir + '/fastclick/lib/fastclick.js',
+			componentsDir + '/jquery/dist/jquery.min.js'
+		]
+		.concat(foundationModules)
+		.concat([baseSrcDir + '/js/app.js']))
+		.pipe(concat('js/app.js'))
+		.pipe(uglify());
+
+	// Only the ticket form needs Chosen
+	var chosen = gulp.src([
+			componentsDir + '/chosen/chosen.jquery.min.js',
+			baseSrcDir + '/js/ticket_form.js'
+		])
+		.pipe(concat('js/chosen.js'))
+		.pipe(uglify());
+
+	var styles = gulp.src(baseSrcDir + '/css/tracker.css')
+		.pipe(concat('css/tracker.css'))
+		.pipe(minifyCss());
+
+	var chosenStyles = gulp.src(componentsDir + '/chosen/chosen.min.css')
+		.pipe(concat('css/chosen.min.css'))
+		.pipe(minifyCss());
 
-gulp.task('copy-styles', function () {
-	gulp.src(baseSrcDir + '/css/*.css').pipe(gulp.dest(baseDestDir + '/css/'));
+	return merge(modernizr, app, chosen, styles, chosenStyles)
+		.pipe(rev())
+		.pipe(gulp.dest(baseDestDir))
+		.pipe(rev.manifest('rev-manifest.json'))
+		.pipe(gulp.dest(baseDestDir));
 });
 
-gulp.task('copy-js', function () {
-	gulp.src(baseSrcDir + '/components/modernizr/modernizr.js').pipe(gulp.dest(baseDestDir + '/js/'));
+gulp.task('gzip', ['bundle'], function () {
+	return gulp.src(baseDestDir + '/{js,css}/*.{js,css}', {base: baseDestDir})
+		.pipe(gzip({gzipOptions: {level: 9}}))
+		.pipe(gulp.dest(baseDestDir));
 });
 
 gulp.task('sass-watch', function() {
-        gulp.watch(baseSrcDir + '/scss/*.scss', ['sass']);
+	gulp.watch(baseSrcDir + '/scss/*.scss', ['sass']);
 });
 
-gulp.task('build', ['build-styles', 'copy-styles', 'copy-js', 'concat-js'])
+gulp.task('build', ['bundle', 'gzip', 'copy-assets'])
 gulp.task('default', ['build-styles']);
@@ -0,0 +1,70 @@
+"""
+URL includes that aren't loaded until they're used, to keep them out of
+instance start up. See tracker.site.importprofile for measuring what start up
+costs.
+"""
+import threading
+
+from django.core.urlresolvers import RegexURLResolver, clear_url_caches
+from django.utils.encoding import force_text
+
+
+_load_lock = threading.RLock()
+
+
+class LazyRegexURLResolver(RegexURLResolver):
+    """
+    The resolver of an include() whose URLconf is only imported when a
+    request matches its prefix, or a URL is reversed through it.
+
+    `urlconf` is a dotted module path, or a function returning a URLconf
+    module or list of patterns, which can do any set up the URLconf needs
+    first. Once it's loaded the URL caches are cleared, so that the root
+    resolver picks up the names in it.
+
+    Reversing any name in the root URLconf loads lazy includes without a
+    namespace, as their names are part of the root's. Ones with a namespace
+    are only loaded for names in that namespace.
+    """
+
+    def __init__(self, regex, urlconf, default_kwargs=None, app_name=None, namespace=None):
+        super(LazyRegexURLResolver, self).__init__(
+            regex, urlconf, default_kwargs, app_name=app_name, namespace=namespace)
+        self.loaded = False
+
+    def load(self):
+        with _load_lock:
+            if self.loaded:
+                return
+
+            if callable(self.urlconf_name):
+                # RegexURLResolver keeps a URLconf that isn't a path as
+                # the module itself
+                self.urlconf_name = self._urlconf_module = self.urlconf_name()
+
+            # imports the module now, rather than whenever it's next used
+            self.urlconf_module
+            self.loaded = True
+
+        clear_url_caches()
+
+    def resolve(self, path):
+        if not self.loaded and self.regex.search(force_text(path)):
+            self.load()
+
+        return super(LazyRegexURLResolver, self).resolve(path)
+
+    @property
+    def url_patterns(self):
+        # reversing a name in a namespace reads these without populating
+        self.load()
+        return super(LazyRegexURLResolver, self).url_patterns
+
+    def _populate(self):
+        self.load()
+        super(LazyRegexURLResolver, self)._populate()
+
+
+def lazy_include(regex, urlconf, app_name=None, namespace=None, kwargs=None):
+    """ url(regex, include(urlconf)), but not loaded until it's used """
+    return LazyRegexURLResolver(regex, urlconf, kwargs, app_name=app_name, namespace=namespace)
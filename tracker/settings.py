@@ -9,7 +9,6 @@ https://docs.djangoproject.com/en/1.6/ref/settings/
 """
 
 from djangae.settings_base import * #Set up some AppEngine specific stuff
-from django.core.urlresolvers import reverse_lazy
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 import os
@@ -38,7 +37,8 @@ INTERNAL_IPS = (
 
 INSTALLED_APPS = (
     'djangae', # Djangae needs to come before django apps in django 1.7 and above
-    'django.contrib.admin',
+    # autodiscovered when it's first used, see tracker.urls
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'djangae.contrib.gauth.datastore',
     'django.contrib.contenttypes',
@@ -57,6 +57,10 @@ INSTALLED_APPS = (
 )
 
 MIDDLEWARE_CLASSES = (
+    # first, so that rejected requests never reach the datastore
+    'tracker.site.middleware.RateLimitMiddleware',
+    # off unless MEMORY_PROFILE_ENABLED is set
+    'tracker.site.middleware.MemoryProfileMiddleware',
     'djangae.contrib.security.middleware.AppEngineSecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,6 +75,11 @@ AUTHENTICATION_BACKENDS = (
     'djangae.contrib.gauth.datastore.backends.AppEngineUserAPIBackend',
 )
 
+TEMPLATE_LOADERS = (
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+)
+
 TEMPLATE_CONTEXT_PROCESSORS = (
     "django.contrib.auth.context_processors.auth",
     "django.core.context_processors.debug",
@@ -94,7 +103,10 @@ SECURE_CHECKS = [
     "tracker.checks.check_csp_is_not_report_only"
 ]
 
-CSP_REPORT_URI = reverse_lazy('report_csp')
+# A fixed path rather than reverse_lazy('report_csp'), as the middleware
+# adds it to every response and reversing it would load the lazily included
+# cspreports URLconf (see tracker.urls) on the first request
+CSP_REPORT_URI = '/csp/report/'
 CSP_REPORTS_LOG = True
 CSP_REPORTS_LOG_LEVEL = 'warning'
 CSP_REPORTS_SAVE = True
@@ -124,6 +136,11 @@ USE_TZ = True
 
 STATIC_URL = '/static-dev/'
 
+# Written by `gulp build`, maps bundle names to their fingerprinted files.
+# Unless it's required, bundles missing from it are served by their own names.
+STATIC_MANIFEST = os.path.join(BASE_DIR, 'tracker', 'static', 'rev-manifest.json')
+STATIC_MANIFEST_REQUIRED = False
+
 # sensible default CPS settings, feel free to modify them
 CSP_DEFAULT_SRC = ("'self'", "*.gstatic.com")
 CSP_STYLE_SRC = ("'self'",)
@@ -144,4 +161,67 @@ CRISPY_TEMPLATE_PACK = 'foundation-5'
 
 AUTH_USER_MODEL = 'djangae.GaeUser'
 
+# How long (in seconds) the project updates endpoint holds a request open
+# waiting for a change, and how often it re-checks memcache meanwhile
+LIVE_POLL_TIMEOUT = 25
+LIVE_POLL_INTERVAL = 1
+
+# Assignment notifications are coalesced over this many seconds per ticket
+# before being sent through the sender class from the given task queue
+ASSIGNMENT_NOTIFICATION_SENDER = 'tracker.site.notifications.EmailNotificationSender'
+ASSIGNMENT_NOTIFICATION_DELAY = 60
+ASSIGNMENT_NOTIFICATION_QUEUE = 'notifications'
+
+# Rows written per transaction by the ticket importer (at most 24)
+TICKET_IMPORT_CHUNK_SIZE = 24
+
+# Task queue for imports of files uploaded in the admin
+TICKET_IMPORT_QUEUE = 'default'
+
+# Page size of the ticket table on the project page
+TICKETS_PER_PAGE = 50
+
+# Page size of a ticket's comments
+COMMENTS_PER_PAGE = 20
+
+# Default and largest page size of API listings, and the most operations
+# one /api/batch request may contain
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+API_BATCH_LIMIT = 100
+
+# Requests allowed per user (or IP address) as (requests, seconds), for reads
+# and writes separately. URL names that aren't in RATE_LIMITS share the
+# defaults. A limit of None turns limiting off for that URL name and kind.
+RATE_LIMIT_ENABLED = True
+RATE_LIMIT_DEFAULTS = {
+    'read': (120, 60),
+    'write': (30, 60),
+}
+RATE_LIMITS = {
+    # these run the most datastore queries per request
+    'project-list': {'read': (30, 60), 'write': (10, 60)},
+    'my-tickets': {'read': (60, 60), 'write': (10, 60)},
+    'api-batch': {'read': None, 'write': (10, 60)},
+    # the long poll only reads memcache, but each request is held open for
+    # up to LIVE_POLL_TIMEOUT, and a page re-requests it as soon as it ends
+    'project-updates': {'read': (30, 60)},
+}
+
+# Memory profiling of a sample of requests, shown on the memory-profile
+# page. Needs tracemalloc, so a patched interpreter on Python 2.
+MEMORY_PROFILE_ENABLED = False
+MEMORY_PROFILE_SAMPLE_RATE = 0.01
+MEMORY_PROFILE_TOP_SITES = 10
+
+# The most that importing the WSGI application and resolving a URL may take
+# in a new interpreter, in seconds, checked by tracker.site.test_importprofile
+# and the import_profile command
+COLD_START_IMPORT_BUDGET = 3.0
+
+# Closed tickets are moved to the archive after this many days
+TICKET_ARCHIVE_AFTER_DAYS = 30
+
+DEFAULT_FROM_EMAIL = 'noreply@potato-tracker.appspotmail.com'
+
 from djangae.contrib.gauth.settings import *
@@ -12,7 +12,9 @@ SECURE_SSL_REDIRECT = True
 SECURE_REDIRECT_EXEMPT = [
     # App Engine doesn't use HTTPS internally, so the /_ah/.* URLs need to be exempt.
     # djangosecure compares these to request.path.lstrip("/"), hence the lack of preceding /
-    r"^_ah/"
+    r"^_ah/",
+    # cron requests are made over plain HTTP too
+    r"^tasks/",
 ]
 
 SECURE_CHECKS += ["tracker.checks.check_csp_sources_not_unsafe"]
@@ -20,4 +22,10 @@ SECURE_CHECKS += ["tracker.checks.check_csp_sources_not_unsafe"]
 DEBUG = False
 TEMPLATE_DEBUG = False
 
+# templates are only read and parsed once per instance
+TEMPLATE_LOADERS = (
+    ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+)
+
 STATIC_URL = '/static/'
+STATIC_MANIFEST_REQUIRED = True
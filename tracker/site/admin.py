@@ -0,0 +1,83 @@
+import os
+
+from django import forms
+from django.conf.urls import patterns, url
+from django.contrib import admin, messages
+from django.contrib.admin.utils import quote
+from django.core.urlresolvers import reverse
+from django.shortcuts import redirect, render
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
+from djangae.db import transaction
+
+from .importer import READERS, start_upload_import
+from .models import Project, TicketImport
+
+
+class TicketImportUploadForm(forms.Form):
+    project = forms.ModelChoiceField(queryset=Project.objects.all())
+    file = forms.FileField(help_text="CSV or JSON Lines with title, description and assignees")
+    format = forms.ChoiceField(choices=[(f, f) for f in sorted(READERS.keys())])
+
+
+class TicketImportAdmin(admin.ModelAdmin):
+    list_display = ('name', 'project', 'committed_rows', 'imported_tickets', 'failed_rows', 'finished')
+    # the change page is the import's status page
+    readonly_fields = list_display + ('error', 'errors_by_row')
+
+    def errors_by_row(self, job):
+        return format_html_join(mark_safe('<br>'), u"{0}", ((error,) for error in job.row_errors))
+    errors_by_row.short_description = "Row errors"
+
+    def get_urls(self):
+        urls = patterns(
+            '',
+            url(
+                r'^upload/$',
+                self.admin_site.admin_view(self.upload_view),
+                name='site_ticketimport_upload'
+            ),
+        )
+        return urls + super(TicketImportAdmin, self).get_urls()
+
+    def upload_view(self, request):
+        form = TicketImportUploadForm(request.POST or None, request.FILES or None)
+
+        if form.is_valid():
+            project = form.cleaned_data['project']
+            upload = form.cleaned_data['file']
+
+            # uploading the same file again resumes the import
+            job, _ = TicketImport.objects.get_or_create(
+                name="{0}:{1}".format(project.pk, os.path.basename(upload.name)),
+                defaults={'project': project, 'created_by': request.user}
+            )
+
+            if job.upload and not (job.finished or job.error):
+                # a second task would import the same rows again
+                messages.error(request, u"{0} is already being imported".format(job.name))
+            else:
+                if job.upload:
+                    job.upload.delete(save=False)
+
+                job.upload = upload
+                job.upload_format = form.cleaned_data['format']
+                job.finished = False
+                job.error = ''
+
+                with transaction.atomic():
+                    job.save()
+                    start_upload_import(job)
+
+                messages.info(request, u"{0} is being imported".format(job.name))
+
+            return redirect(reverse('admin:site_ticketimport_change', args=(quote(job.pk),)))
+
+        return render(request, "admin/site/ticketimport/upload.html", {
+            'form': form,
+            'opts': self.model._meta,
+            'title': "Import tickets",
+        })
+
+
+admin.site.register(TicketImport, TicketImportAdmin)
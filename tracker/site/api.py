@@ -0,0 +1,444 @@
+"""
+JSON API for projects and tickets.
+
+    GET     /api/projects/                  list projects
+    POST    /api/projects/                  create a project
+    GET     /api/projects/<id>/             get a project
+    PUT     /api/projects/<id>/             update a project
+    DELETE  /api/projects/<id>/             delete a project with no tickets
+    GET     /api/projects/<id>/tickets/     list a project's tickets
+    POST    /api/projects/<id>/tickets/     create a ticket in a project
+    GET     /api/tickets/<id>/              get a ticket
+    PUT     /api/tickets/<id>/              update a ticket
+    DELETE  /api/tickets/<id>/              delete a ticket
+    POST    /api/batch                      run many of the above in one request
+
+Request bodies are JSON objects. An update only needs the fields that change.
+Responses include only the fields named in ?fields=title,status (or a "fields"
+list in a batch operation), or every field if none are named.
+
+Listings are a page of "objects" plus a "next_cursor" to pass back as
+?cursor= for the next page. Ticket listings take the same sort and filter
+parameters as the project page. The project listing is the projects the user
+is a member of, sorted by ?sort=title, -created or -modified.
+
+Every request needs a logged in user, who can only see and change the
+projects they're a member of and their tickets. Only owners can update or
+delete a project.
+
+Writes go through the same forms as the HTML views, so they're validated the
+same way and still update the workload rollups, the live version and the
+assignment notifications. They need the CSRF token in an X-CSRFToken header.
+"""
+import collections
+import json
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.generic import View
+
+from .forms import ProjectForm, TicketForm, TicketFilterForm
+from .models import Project, ProjectMembership, Ticket, UserProjectIndex
+from .paging import InvalidCursor, paginate, paginate_list
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, errors=None):
+        super(ApiError, self).__init__(message)
+        self.status = status
+        self.message = message
+        self.errors = errors
+
+    def as_dict(self):
+        data = {"error": self.message}
+        if self.errors:
+            data["errors"] = self.errors
+        return data
+
+
+class Resource(object):
+    model = None
+    form_class = None
+    fields = ()
+    # the attribute of an instance holding the id of its project
+    project_id_attribute = 'project_id'
+
+    def get_form_kwargs(self, user, instance, parent):
+        return {"user": user}
+
+    def get_initial(self, instance):
+        return {}
+
+    def get_project_id(self, instance):
+        return getattr(instance, self.project_id_attribute)
+
+    def get_fields(self, fields=None):
+        if not fields:
+            return self.fields
+
+        if isinstance(fields, basestring):
+            fields = fields.split(',')
+
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise ApiError(400, "Unknown fields: {0}".format(", ".join(sorted(unknown))))
+
+        return fields
+
+    def serialize(self, obj, fields=None):
+        data = {}
+        for name in self.get_fields(fields):
+            value = getattr(obj, self.model._meta.get_field(name).attname)
+            if isinstance(value, set):
+                value = sorted(value)
+            data[name] = value
+        return data
+
+    def save(self, user, data, instance=None, parent=None):
+        form_data = self.get_initial(instance) if instance else {}
+        form_data.update(data)
+
+        form = self.form_class(
+            data=form_data, instance=instance, **self.get_form_kwargs(user, instance, parent))
+
+        if not form.is_valid():
+            errors = dict(
+                (field, [message for error in field_errors for message in error.messages])
+                for field, field_errors in form.errors.as_data().items()
+            )
+            raise ApiError(400, "Invalid data", errors=errors)
+
+        return form.save()
+
+    def delete(self, instance):
+        instance.delete()
+
+
+class ProjectResource(Resource):
+    model = Project
+    form_class = ProjectForm
+    fields = ('id', 'title', 'created_by', 'created', 'modified')
+    sort_choices = ('title', '-created', '-modified')
+    project_id_attribute = 'pk'
+
+    def get_initial(self, project):
+        return {"title": project.title}
+
+    def get_page(self, params, project_ids):
+        sort = params.get('sort')
+        if sort not in self.sort_choices:
+            sort = self.sort_choices[0]
+
+        # a user is only a member of a few projects, so they're paged in
+        # memory from a batch get rather than by a query over every project
+        projects = Project.objects.in_bulk(list(project_ids)).values() if project_ids else []
+        return paginate_list(projects, sort, cursor=params.get('cursor'),
+                             page_size=get_page_size(params))
+
+    def delete(self, project):
+        # deleting the tickets as well would skip their delete() hooks
+        if project.tickets.exists():
+            raise ApiError(409, "The project still has tickets")
+
+        project.delete()
+
+
+class TicketResource(Resource):
+    model = Ticket
+    form_class = TicketForm
+    fields = (
+        'id', 'title', 'description', 'description_html', 'description_excerpt',
+        'project', 'created_by', 'assignees', 'status', 'created', 'modified', 'closed_at',
+    )
+
+    def get_form_kwargs(self, user, ticket, project):
+        kwargs = super(TicketResource, self).get_form_kwargs(user, ticket, project)
+        kwargs["project"] = project or ticket.project
+        return kwargs
+
+    def get_initial(self, ticket):
+        return {
+            "title": ticket.title,
+            "description": ticket.description,
+            "status": ticket.status,
+            "assignees": list(ticket.assignees_ids),
+        }
+
+    def get_page(self, params, project):
+        filters = TicketFilterForm(params)
+        return paginate(filters.filter(project.tickets.all()), filters.get_sort(),
+                        cursor=filters.get('cursor'), page_size=get_page_size(params))
+
+
+RESOURCES = {
+    'project': ProjectResource(),
+    'ticket': TicketResource(),
+}
+
+
+def get_page_size(params):
+    try:
+        limit = int(params.get('limit') or settings.API_PAGE_SIZE)
+    except ValueError:
+        raise ApiError(400, "limit must be a number")
+
+    return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+
+def parse_body(request):
+    try:
+        data = json.loads(request.body or '{}')
+    except ValueError:
+        raise ApiError(400, "The request body isn't valid JSON")
+
+    if not isinstance(data, dict):
+        raise ApiError(400, "The request body must be a JSON object")
+
+    return data
+
+
+class ApiView(View):
+    http_method_names = ['get', 'post', 'put', 'delete']
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            if not request.user.is_authenticated():
+                raise ApiError(403, "Login required")
+
+            return super(ApiView, self).dispatch(request, *args, **kwargs)
+        except Http404:
+            return JsonResponse({"error": "Not found"}, status=404)
+        except ApiError as e:
+            return JsonResponse(e.as_dict(), status=e.status)
+
+    def get_project_ids(self):
+        if not hasattr(self, '_project_ids'):
+            self._project_ids = UserProjectIndex.get_project_ids(self.request.user.pk)
+        return self._project_ids
+
+    def check_access(self, project_id, owner=False):
+        if project_id not in self.get_project_ids():
+            raise ApiError(403, "Not a member of this project")
+
+        if owner:
+            membership_id = ProjectMembership.make_id(project_id, self.request.user.pk)
+            if not ProjectMembership.objects.filter(
+                    pk=membership_id, role=ProjectMembership.OWNER).exists():
+                raise ApiError(403, "Only the project's owners can do this")
+
+    def respond(self, resource, obj, status=200):
+        data = resource.serialize(obj, self.request.GET.get('fields'))
+        return JsonResponse(data, status=status)
+
+    def respond_page(self, resource, page):
+        fields = resource.get_fields(self.request.GET.get('fields'))
+
+        try:
+            objects, next_cursor = page()
+        except InvalidCursor:
+            raise ApiError(400, "Invalid cursor")
+
+        return JsonResponse({
+            "objects": [resource.serialize(obj, fields) for obj in objects],
+            "next_cursor": next_cursor,
+        })
+
+
+class ProjectListApiView(ApiView):
+    resource = RESOURCES['project']
+
+    def get(self, request):
+        return self.respond_page(
+            self.resource, lambda: self.resource.get_page(request.GET, self.get_project_ids()))
+
+    def post(self, request):
+        project = self.resource.save(request.user, parse_body(request))
+        return self.respond(self.resource, project, status=201)
+
+
+class ProjectApiView(ApiView):
+    resource = RESOURCES['project']
+
+    def get_object(self, owner=False):
+        project = get_object_or_404(Project, pk=self.kwargs['project_id'])
+        self.check_access(project.pk, owner=owner)
+        return project
+
+    def get(self, request, project_id):
+        return self.respond(self.resource, self.get_object())
+
+    def put(self, request, project_id):
+        project = self.resource.save(
+            request.user, parse_body(request), instance=self.get_object(owner=True))
+        return self.respond(self.resource, project)
+
+    def delete(self, request, project_id):
+        self.resource.delete(self.get_object(owner=True))
+        return JsonResponse({}, status=200)
+
+
+class TicketListApiView(ApiView):
+    resource = RESOURCES['ticket']
+
+    def get_project(self):
+        project = get_object_or_404(Project, pk=self.kwargs['project_id'])
+        self.check_access(project.pk)
+        return project
+
+    def get(self, request, project_id):
+        project = self.get_project()
+        return self.respond_page(
+            self.resource, lambda: self.resource.get_page(request.GET, project))
+
+    def post(self, request, project_id):
+        ticket = self.resource.save(request.user, parse_body(request), parent=self.get_project())
+        return self.respond(self.resource, ticket, status=201)
+
+
+class TicketApiView(ApiView):
+    resource = RESOURCES['ticket']
+
+    def get_object(self):
+        ticket = get_object_or_404(Ticket, pk=self.kwargs['ticket_id'])
+        self.check_access(ticket.project_id)
+        return ticket
+
+    def get(self, request, ticket_id):
+        return self.respond(self.resource, self.get_object())
+
+    def put(self, request, ticket_id):
+        ticket = self.resource.save(request.user, parse_body(request), instance=self.get_object())
+        return self.respond(self.resource, ticket)
+
+    def delete(self, request, ticket_id):
+        self.resource.delete(self.get_object())
+        return JsonResponse({}, status=200)
+
+
+class BatchApiView(ApiView):
+    """
+    Runs a list of operations, each one of:
+
+        {"method": "get", "type": "ticket", "id": 1, "fields": ["title"]}
+        {"method": "create", "type": "ticket", "project": 1, "data": {...}}
+        {"method": "update", "type": "project", "id": 1, "data": {...}}
+        {"method": "delete", "type": "ticket", "id": 1}
+
+    Every object that the operations refer to is read in one batch get per
+    type before any of them run. The response has a result per operation, in
+    the same order, with its own status. One failed operation doesn't stop
+    the others.
+    """
+    http_method_names = ['post']
+
+    def post(self, request):
+        operations = parse_body(request).get('operations')
+
+        if not isinstance(operations, list):
+            raise ApiError(400, "operations must be a list")
+        if len(operations) > settings.API_BATCH_LIMIT:
+            raise ApiError(400, "At most {0} operations are allowed".format(settings.API_BATCH_LIMIT))
+
+        ids = collections.defaultdict(set)
+        for operation in operations:
+            if not isinstance(operation, dict):
+                continue
+
+            for type_name, key in ((operation.get('type'), 'id'), ('project', 'project')):
+                try:
+                    ids[type_name].add(int(operation[key]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+
+        objects = dict(
+            (type_name, resource.model.objects.in_bulk(list(ids[type_name])))
+            for type_name, resource in RESOURCES.items() if ids[type_name]
+        )
+
+        results = []
+        for operation in operations:
+            try:
+                status, data = self.run(operation, objects)
+                results.append({"status": status, "data": data})
+            except ApiError as e:
+                result = e.as_dict()
+                result["status"] = e.status
+                results.append(result)
+
+        return JsonResponse({"results": results})
+
+    def get_object(self, objects, type_name, pk):
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise ApiError(400, "Missing or invalid {0} id".format(type_name))
+
+        # objects created by earlier operations weren't in the batch get
+        cache = objects.setdefault(type_name, {})
+        if pk not in cache:
+            try:
+                cache[pk] = RESOURCES[type_name].model.objects.get(pk=pk)
+            except RESOURCES[type_name].model.DoesNotExist:
+                raise ApiError(404, "Not found")
+
+        return cache[pk]
+
+    def run(self, operation, objects):
+        if not isinstance(operation, dict):
+            raise ApiError(400, "Each operation must be an object")
+
+        method = operation.get('method')
+        type_name = operation.get('type')
+
+        if type_name not in RESOURCES:
+            raise ApiError(400, "Unknown type {0}".format(type_name))
+        resource = RESOURCES[type_name]
+
+        data = operation.get('data') or {}
+        if not isinstance(data, dict):
+            raise ApiError(400, "data must be an object")
+
+        user = self.request.user
+        # only owners can change a project, members can change its tickets
+        owner = type_name == 'project' and method in ('update', 'delete')
+
+        if method == 'get':
+            obj = self.get_object(objects, type_name, operation.get('id'))
+            self.check_access(resource.get_project_id(obj))
+            return 200, resource.serialize(obj, operation.get('fields'))
+
+        if method == 'create':
+            parent = None
+            if type_name == 'ticket':
+                parent = self.get_object(objects, 'project', operation.get('project'))
+                self.check_access(parent.pk)
+
+            obj = resource.save(user, data, parent=parent)
+            objects.setdefault(type_name, {})[obj.pk] = obj
+            if type_name == 'project':
+                # the user now owns it, which the cached index doesn't know
+                self.get_project_ids().add(obj.pk)
+            return 201, resource.serialize(obj, operation.get('fields'))
+
+        if method == 'update':
+            obj = self.get_object(objects, type_name, operation.get('id'))
+            self.check_access(resource.get_project_id(obj), owner=owner)
+            obj = resource.save(user, data, instance=obj)
+            return 200, resource.serialize(obj, operation.get('fields'))
+
+        if method == 'delete':
+            obj = self.get_object(objects, type_name, operation.get('id'))
+            self.check_access(resource.get_project_id(obj), owner=owner)
+            resource.delete(obj)
+            del objects[type_name][obj.pk]
+            return 200, {}
+
+        raise ApiError(400, "Unknown method {0}".format(method))
+
+
+project_list_api_view = ProjectListApiView.as_view()
+project_api_view = ProjectApiView.as_view()
+ticket_list_api_view = TicketListApiView.as_view()
+ticket_api_view = TicketApiView.as_view()
+batch_api_view = BatchApiView.as_view()
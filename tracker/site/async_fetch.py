@@ -0,0 +1,47 @@
+"""
+Runs independent datastore reads at the same time, so a request waits for
+the slowest read rather than for all of them in turn.
+
+    project = fetch_async(Project.objects.get, pk=project_id)
+    users = fetch_async(lambda: list(User.objects.all()))
+    project, users = project.get_result(), users.get_result()
+
+djangae's ORM only makes blocking datastore calls and doesn't expose the
+async API's futures. Each fetch therefore runs in its own thread, which is
+allowed on a threadsafe python27 app. get_result() waits for the read and
+re-raises any exception from it in the calling thread, so errors such as
+Http404 behave as if the read had happened inline.
+
+A queryset is lazy, so a fetch has to evaluate it (with list(), for example)
+or nothing happens until the result is used.
+"""
+import sys
+import threading
+
+
+class Future(object):
+    def __init__(self, func, *args, **kwargs):
+        self._result = None
+        self._exc_info = None
+
+        self._thread = threading.Thread(target=self._run, args=(func, args, kwargs))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, func, args, kwargs):
+        try:
+            self._result = func(*args, **kwargs)
+        except Exception:
+            self._exc_info = sys.exc_info()
+
+    def get_result(self):
+        self._thread.join()
+
+        if self._exc_info:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+
+        return self._result
+
+
+def fetch_async(func, *args, **kwargs):
+    return Future(func, *args, **kwargs)
@@ -0,0 +1,254 @@
+"""
+Batched data migrations, for backfilling or rewriting every entity of a kind.
+
+A migration subclasses DataMigration, sets `model`, and implements either
+`migrate_entity` or `migrate_batch`. It's referred to by its dotted path:
+
+    start_migration('tracker.site.datamigrations.SomeMigration')
+
+The migration walks the kind in key order, one batch per deferred task. After
+each batch, it checkpoints the last key it processed in a MigrationState.
+A failed task is retried from that checkpoint, so a batch may occasionally
+run twice and migrations must be idempotent. `batch_size`, `delay` (seconds
+between batches) and `queue` control how hard a migration hits the datastore.
+
+run_migration_sync() runs the same batches in-process, for tests and the
+management command.
+"""
+import collections
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from google.appengine.ext import deferred
+
+from djangae.db import transaction
+
+from .models import (
+    ArchivedTicket,
+    Comment,
+    MigrationState,
+    Project,
+    ProjectMembership,
+    Ticket,
+    WorkloadRollup,
+)
+
+
+class DataMigration(object):
+    model = None
+    batch_size = 100
+    delay = 0
+    queue = 'default'
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def migrate_batch(self, entities):
+        for entity in entities:
+            self.migrate_entity(entity)
+
+    def migrate_entity(self, entity):
+        raise NotImplementedError()
+
+
+def run_batch(path):
+    """ Migrates the next batch after the checkpoint and returns the state """
+    migration = import_string(path)()
+    state, _ = MigrationState.objects.get_or_create(name=path)
+
+    if state.finished:
+        return state
+
+    queryset = migration.get_queryset().order_by('pk')
+    if state.cursor is not None:
+        queryset = queryset.filter(pk__gt=migration.model._meta.pk.to_python(state.cursor))
+
+    batch = list(queryset[:migration.batch_size])
+
+    if batch:
+        migration.migrate_batch(batch)
+        state.cursor = batch[-1].pk
+
+    state.processed += len(batch)
+    state.batches += 1
+    state.finished = len(batch) < migration.batch_size
+    state.save()
+
+    return state
+
+
+def _run_deferred(path):
+    state = run_batch(path)
+
+    if not state.finished:
+        migration = import_string(path)
+        deferred.defer(_run_deferred, path, _countdown=migration.delay, _queue=migration.queue)
+
+
+def start_migration(path, reset=False):
+    if reset:
+        MigrationState.objects.filter(name=path).delete()
+
+    deferred.defer(_run_deferred, path, _queue=import_string(path).queue)
+
+
+def run_migration_sync(path, reset=False):
+    if reset:
+        MigrationState.objects.filter(name=path).delete()
+
+    state = run_batch(path)
+    while not state.finished:
+        state = run_batch(path)
+
+    return state
+
+
+class BackfillTicketStatus(DataMigration):
+    """ Stores the default status on tickets created before there was one """
+    model = Ticket
+
+    def migrate_entity(self, ticket):
+        # update() rather than save() so that `modified` is left alone
+        Ticket.objects.filter(pk=ticket.pk).update(status=ticket.status)
+
+
+class BackfillUnassignedFlag(DataMigration):
+    """ Stores whether each ticket has no assignees, for the unassigned filter """
+    model = Ticket
+
+    def migrate_entity(self, ticket):
+        is_unassigned = not ticket.assignees_ids
+        if ticket.is_unassigned != is_unassigned:
+            Ticket.objects.filter(pk=ticket.pk).update(is_unassigned=is_unassigned)
+
+
+class RenderTicketDescriptions(DataMigration):
+    """ Stores the rendered Markdown of tickets saved before it was, or with older sanitising rules """
+    model = Ticket
+
+    def migrate_entity(self, ticket):
+        html, excerpt = ticket.description_html, ticket.description_excerpt
+        ticket.render_description()
+
+        if (html, excerpt) != (ticket.description_html, ticket.description_excerpt):
+            Ticket.objects.filter(pk=ticket.pk).update(
+                description_html=ticket.description_html,
+                description_excerpt=ticket.description_excerpt
+            )
+
+
+class BackfillCommentCounts(DataMigration):
+    """ Recounts each ticket's comments """
+    model = Ticket
+
+    def migrate_entity(self, ticket):
+        comments = Comment.objects.filter(ticket=ticket).order_by('-created')
+        count = comments.count()
+        last_comment_at = comments[0].created if count else None
+
+        if (ticket.comment_count, ticket.last_comment_at) != (count, last_comment_at):
+            Ticket.objects.filter(pk=ticket.pk).update(
+                comment_count=count, last_comment_at=last_comment_at)
+
+
+class BackfillProjectTicketCounts(DataMigration):
+    """ Counts the tickets of projects created before the count was stored """
+    model = Project
+
+    def migrate_entity(self, project):
+        count = Ticket.objects.filter(project=project).count()
+        if project.ticket_count != count:
+            Project.objects.filter(pk=project.pk).update(ticket_count=count)
+
+
+class BackfillProjectMemberships(DataMigration):
+    """
+    Gives the users of projects created before there were members access to
+    them: the creator as owner, and whoever created or is assigned a ticket
+    as a member.
+    """
+    model = Project
+    batch_size = 10
+
+    def migrate_entity(self, project):
+        if project.created_by_id:
+            ProjectMembership.ensure_owner(project.pk, project.created_by_id)
+
+        user_ids = set()
+        for ticket in Ticket.objects.filter(project=project):
+            user_ids.update(ticket.assignees_ids)
+            if ticket.created_by_id:
+                user_ids.add(ticket.created_by_id)
+        user_ids.discard(project.created_by_id)
+
+        existing = set(
+            membership.user_id
+            for membership in ProjectMembership.objects.filter(project=project)
+        )
+
+        for user_id in user_ids - existing:
+            ProjectMembership(project=project, user_id=user_id).save()
+
+
+class ArchiveClosedTickets(DataMigration):
+    """ Moves tickets closed more than TICKET_ARCHIVE_AFTER_DAYS ago to ArchivedTicket """
+    model = Ticket
+
+    def get_queryset(self):
+        # closed_at can't be filtered on here, as an inequality filter would
+        # have to be the first sort order instead of the key
+        return Ticket.objects.filter(status=Ticket.CLOSED)
+
+    def migrate_batch(self, tickets):
+        cutoff = timezone.now() - timedelta(days=settings.TICKET_ARCHIVE_AFTER_DAYS)
+
+        def is_archivable(ticket):
+            return ticket.status == Ticket.CLOSED and ticket.closed_at and ticket.closed_at < cutoff
+
+        for ticket in tickets:
+            if not is_archivable(ticket):
+                continue
+
+            with transaction.atomic(xg=True):
+                # checked again in the transaction, as the ticket may have
+                # been reopened since the batch was read
+                try:
+                    ticket = Ticket.objects.get(pk=ticket.pk)
+                except Ticket.DoesNotExist:
+                    continue
+                if not is_archivable(ticket):
+                    continue
+
+                ArchivedTicket.from_ticket(ticket).save()
+                ticket.delete(keep_comments=True)
+
+
+class ReconcileWorkload(DataMigration):
+    """ Recounts each project's workload rollups from its tickets """
+    model = Project
+    batch_size = 10
+
+    def migrate_entity(self, project):
+        counts = collections.Counter()
+        for ticket in Ticket.objects.filter(project=project):
+            counts.update(ticket.workload_keys())
+
+        existing = dict(
+            (rollup.pk, rollup)
+            for rollup in WorkloadRollup.objects.filter(project=project)
+        )
+
+        for (project_id, assignee_id, status), count in counts.items():
+            rollup_id = WorkloadRollup.make_id(project_id, assignee_id, status)
+            rollup = existing.pop(rollup_id, None) or WorkloadRollup(
+                id=rollup_id, project_id=project_id, assignee_id=assignee_id, status=status)
+
+            if rollup.count != count or rollup._state.adding:
+                rollup.count = count
+                rollup.save()
+
+        # whatever is left over no longer has any tickets
+        for rollup in existing.values():
+            rollup.delete()
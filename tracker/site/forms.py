@@ -1,20 +1,53 @@
+import copy
+
 from django import forms
 from django.contrib.auth import get_user_model
+from django.utils import six
 
 from crispy_forms_foundation.forms import FoundationModelForm
+from crispy_forms_foundation.layout import HTML, Layout
+
+from .models import Comment, Project, ProjectMembership, Ticket
+from .notifications import queue_assignment_notifications
+
+
+class BaseTrackerFormMetaclass(type(FoundationModelForm)):
+    def __new__(mcs, name, bases, attrs):
+        new_class = super(BaseTrackerFormMetaclass, mcs).__new__(mcs, name, bases, attrs)
+
+        # set on the class's fields, which each instance gets a copy of
+        for field in new_class.base_fields.values():
+            field.widget.attrs['placeholder'] = field.label
 
-from .models import Project, Ticket
+        return new_class
 
 
-class BaseTrackerForm(FoundationModelForm):
+class BaseTrackerForm(six.with_metaclass(BaseTrackerFormMetaclass, FoundationModelForm)):
     def __init__(self, user=None, title=None, *args, **kwargs):
         self.title = title
         self.user = user
 
         super(BaseTrackerForm, self).__init__(*args, **kwargs)
 
-        for field in self.fields.values():
-            field.widget.attrs['placeholder'] = field.label
+    def init_helper(self):
+        # The helper and its layout are the same for every instance of a
+        # form class, apart from the title. They're built the first time
+        # the class is used, then each instance gets a shallow copy.
+        cls = type(self)
+
+        if '_helper' not in cls.__dict__:
+            title, self.title = self.title, None
+            super(BaseTrackerForm, self).init_helper()
+            self.title = title
+            cls._helper = self.helper
+
+        self.helper = copy.copy(cls._helper)
+        self.helper.form = self
+
+        fields = list(cls._helper.layout.fields)
+        if self.title:
+            fields.insert(0, HTML(self.title_templatestring.format(self.title)))
+        self.helper.layout = Layout(*fields)
 
     def save(self, *args, **kwargs):
         commit = kwargs.pop('commit', True)
@@ -38,7 +71,9 @@ class ProjectForm(BaseTrackerForm):
         fields = ('title',)
 
     def pre_save(self, instance):
-        instance.created_by = self.user
+        # the creator owns the project, so editing it mustn't change who that is
+        if instance._state.adding:
+            instance.created_by = self.user
 
 class EmailChoiceField(forms.ModelMultipleChoiceField):
     def label_from_instance(self, obj):
@@ -48,16 +83,30 @@ class TicketForm(BaseTrackerForm):
     assignees = EmailChoiceField(queryset=None, required=False)
     assignees.help_text = ''
 
+    # optional so that a ticket's status is kept when it isn't posted
+    status = forms.ChoiceField(choices=Ticket.STATUS_CHOICES, required=False)
+
     class Meta:
         model = Ticket
-        fields = ('title', 'description', 'assignees',)
+        fields = ('title', 'description', 'status', 'assignees',)
 
-    def __init__(self, project=None, *args, **kwargs):
+    def __init__(self, project=None, candidates=None, *args, **kwargs):
         self.project = project
         super(TicketForm, self).__init__(*args, **kwargs)
 
+        field = self.fields['assignees']
+        field.queryset = get_user_model().objects.all()
+
+        # users that were already fetched are used for the choices instead
+        # of querying again when the form is rendered
+        if candidates is not None:
+            field.choices = [(user.pk, field.label_from_instance(user)) for user in candidates]
+
+        # kept to work out who to notify once the ticket is saved
+        self.previous_assignee_ids = set(self.instance.assignees_ids)
 
-        self.fields['assignees'].queryset = get_user_model().objects.all()
+    def clean_status(self):
+        return self.cleaned_data['status'] or self.instance.status
 
     def clean(self):
         super(TicketForm, self).clean()
@@ -71,6 +120,110 @@ class TicketForm(BaseTrackerForm):
         except Ticket.DoesNotExist:
             pass
 
+    def save(self, *args, **kwargs):
+        instance = super(TicketForm, self).save(*args, **kwargs)
+
+        if kwargs.get('commit', True) and instance.assignees_ids != self.previous_assignee_ids:
+            queue_assignment_notifications(instance, self.previous_assignee_ids)
+
+        return instance
+
     def pre_save(self, instance):
         instance.created_by = self.user
         instance.project = self.project
+
+
+class CommentForm(BaseTrackerForm):
+    submit = "Add comment"
+
+    class Meta:
+        model = Comment
+        fields = ('body',)
+
+    def __init__(self, ticket=None, *args, **kwargs):
+        self.ticket = ticket
+        super(CommentForm, self).__init__(*args, **kwargs)
+
+    def pre_save(self, instance):
+        instance.author = self.user
+        instance.ticket = self.ticket
+
+
+class MembershipForm(BaseTrackerForm):
+    submit = "Add member"
+
+    email = forms.EmailField(label="Email")
+
+    class Meta:
+        model = ProjectMembership
+        fields = ('email', 'role',)
+
+    def __init__(self, project=None, *args, **kwargs):
+        self.project = project
+        super(MembershipForm, self).__init__(*args, **kwargs)
+
+    def clean_email(self):
+        email = self.cleaned_data['email']
+
+        try:
+            self.member = get_user_model().objects.get(email=email)
+        except get_user_model().DoesNotExist:
+            raise forms.ValidationError("Nobody with that email address has logged in yet")
+
+        if self.member.pk == self.project.created_by_id:
+            raise forms.ValidationError("That user created the project, so always owns it")
+
+        return email
+
+    def pre_save(self, instance):
+        instance.project = self.project
+        instance.user = self.member
+
+
+class TicketImportForm(forms.ModelForm):
+    """ Validates the imported fields of a ticket the same way TicketForm does """
+    class Meta:
+        model = Ticket
+        fields = ('title', 'description',)
+
+
+class TicketFilterForm(forms.Form):
+    """ The sorting, filtering and paging options of a project's ticket table """
+    SORT_CHOICES = (
+        ('-modified', 'Last updated'),
+        ('-created', 'Newest'),
+        ('title', 'Title'),
+    )
+
+    sort = forms.ChoiceField(choices=SORT_CHOICES, required=False)
+    status = forms.ChoiceField(
+        choices=(('', 'Active'), (Ticket.CLOSED, 'Closed')), required=False)
+    assignee = forms.IntegerField(required=False)
+    unassigned = forms.BooleanField(required=False)
+    created_by = forms.IntegerField(required=False)
+    cursor = forms.CharField(required=False)
+
+    def get(self, name):
+        # invalid options are ignored rather than reported
+        if not hasattr(self, 'cleaned_data'):
+            self.is_valid()
+        return self.cleaned_data.get(name)
+
+    def get_sort(self):
+        return self.get('sort') or self.SORT_CHOICES[0][0]
+
+    def filter(self, queryset):
+        if self.get('status') == Ticket.CLOSED:
+            queryset = queryset.filter(status=Ticket.CLOSED)
+        else:
+            queryset = queryset.filter(status__in=Ticket.ACTIVE_STATUSES)
+
+        if self.get('unassigned'):
+            queryset = queryset.filter(is_unassigned=True)
+        elif self.get('assignee'):
+            queryset = queryset.filter(assignees=self.get('assignee'))
+
+        if self.get('created_by'):
+            queryset = queryset.filter(created_by=self.get('created_by'))
+
+        return queryset
@@ -0,0 +1,226 @@
+"""
+Bulk ticket import from CSV or JSON Lines files.
+
+Rows are read lazily and written in chunks. Each chunk's tickets are put in
+one batch, in the same cross-group transaction as the TicketImport
+checkpoint. If an import fails part way, running it again skips the rows
+that were already committed without creating duplicates. A cross-group
+transaction can span at most 25 entity groups, which limits the chunk size.
+
+Files uploaded in the admin are stored on the TicketImport and imported by
+a deferred task, which is retried from the checkpoint if it fails or runs
+out of time.
+"""
+import collections
+import csv
+import itertools
+import json
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from djangae.db import transaction
+from google.appengine.ext import deferred
+
+from .forms import TicketImportForm
+from .live import bump_project_version
+from .models import Project, Ticket, TicketImport, WorkloadRollup
+
+
+# every ticket is its own entity group, plus one for the checkpoint
+MAX_CHUNK_SIZE = 24
+
+# the most values the datastore allows in an IN filter
+MAX_IN_VALUES = 30
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def read_csv(f):
+    for row in csv.DictReader(f):
+        yield dict(
+            (key, (value or '').decode('utf-8'))
+            for key, value in row.items() if key
+        )
+
+
+def read_jsonl(f):
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise ImportFileError("Line {0} is not valid JSON".format(line_number))
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+def split_emails(value):
+    if not value:
+        return []
+
+    if isinstance(value, basestring):
+        value = re.split(r'[\s,;]+', value)
+
+    return [email.strip() for email in value if email.strip()]
+
+
+class TicketImporter(object):
+    def __init__(self, job, chunk_size=None):
+        self.job = job
+        self.chunk_size = min(chunk_size or settings.TICKET_IMPORT_CHUNK_SIZE, MAX_CHUNK_SIZE)
+
+    def run(self, rows, progress=None):
+        """
+        Imports `rows` (dicts with title, description and assignees keys),
+        starting after the last committed row of the job. `progress` is
+        called after each chunk with the job and that chunk's row errors.
+        """
+        rows = itertools.islice(rows, self.job.committed_rows, None)
+
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                break
+
+            errors = self.import_chunk(chunk)
+
+            if progress:
+                progress(self.job, errors)
+
+        self.job.finished = True
+        self.job.save()
+        return self.job
+
+    def resolve_assignees(self, emails):
+        """
+        Maps user emails to their ids. Emails are stored as given, so each
+        one is looked up as written and in lower case.
+        """
+        lookups = sorted(set(emails) | set(email.lower() for email in emails))
+        user_ids = {}
+
+        for start in range(0, len(lookups), MAX_IN_VALUES):
+            users = get_user_model().objects.filter(
+                email__in=lookups[start:start + MAX_IN_VALUES])
+            user_ids.update((user.email, user.pk) for user in users)
+
+        return user_ids
+
+    def import_chunk(self, chunk):
+        emails = set(itertools.chain.from_iterable(
+            split_emails(row.get('assignees')) for row in chunk
+        ))
+        user_ids = self.resolve_assignees(emails)
+
+        tickets = []
+        errors = []
+
+        for row_number, row in enumerate(chunk, self.job.committed_rows + 1):
+            ticket, row_errors = self.build_ticket(row, user_ids)
+
+            if row_errors:
+                errors.append((row_number, row_errors))
+            else:
+                tickets.append(ticket)
+
+        with transaction.atomic(xg=True):
+            Ticket.objects.bulk_create(tickets)
+
+            self.job.committed_rows += len(chunk)
+            self.job.imported_tickets += len(tickets)
+            self.job.failed_rows += len(errors)
+            self.job.save()
+
+        # bulk_create skips Ticket.save(), so do what it would have done
+        counts = collections.Counter(itertools.chain.from_iterable(
+            ticket.workload_keys() for ticket in tickets
+        ))
+        for key, count in counts.items():
+            WorkloadRollup.increment(key, count)
+        if tickets:
+            Project.increment_ticket_count(self.job.project_id, len(tickets))
+        bump_project_version(self.job.project_id)
+
+        return errors
+
+    def build_ticket(self, row, user_ids):
+        errors = []
+
+        form = TicketImportForm(data={
+            'title': row.get('title') or '',
+            'description': row.get('description') or '',
+        })
+
+        if form.is_valid():
+            ticket = form.save(commit=False)
+        else:
+            ticket = None
+            for field, field_errors in form.errors.items():
+                errors.extend(u"{0}: {1}".format(field, e) for e in field_errors)
+
+        assignee_ids = set()
+        for email in split_emails(row.get('assignees')):
+            user_id = user_ids.get(email) or user_ids.get(email.lower())
+            if user_id:
+                assignee_ids.add(user_id)
+            else:
+                errors.append(u"assignees: unknown user {0}".format(email))
+
+        if errors:
+            return None, errors
+
+        ticket.project_id = self.job.project_id
+        ticket.created_by_id = self.job.created_by_id
+        ticket.assignees_ids = assignee_ids
+        # bulk_create doesn't call save(), which would do these
+        ticket.is_unassigned = not assignee_ids
+        ticket.render_description()
+        return ticket, []
+
+
+def record_row_errors(job, errors):
+    # keeps the first few for the admin, the rest are only counted
+    room = TicketImport.MAX_ROW_ERRORS - len(job.row_errors)
+    if errors and room > 0:
+        job.row_errors.extend(
+            u"Row {0}: {1}".format(row_number, u"; ".join(row_errors))
+            for row_number, row_errors in errors[:room]
+        )
+        job.save()
+
+
+def run_upload(name):
+    """ Imports the uploaded file of the named job, from its checkpoint """
+    try:
+        job = TicketImport.objects.get(pk=name)
+    except TicketImport.DoesNotExist:
+        return
+
+    if job.finished or job.error:
+        return
+
+    job.upload.open('rb')
+    try:
+        TicketImporter(job).run(READERS[job.upload_format](job.upload), progress=record_row_errors)
+    except ImportFileError as e:
+        # retrying would fail on the same line, so stop until it's uploaded again
+        job.error = unicode(e)
+        job.save()
+    finally:
+        job.upload.close()
+
+
+def start_upload_import(job):
+    """ Queues the import of the job's uploaded file, call in a transaction """
+    deferred.defer(run_upload, job.pk, _queue=settings.TICKET_IMPORT_QUEUE, _transactional=True)
@@ -0,0 +1,155 @@
+"""
+Import time of an instance's cold start.
+
+profile_cold_start() times every module imported from importing tracker.wsgi
+until a path has been resolved against the URLconf, which is what the first
+request to a new instance waits for. It needs a fresh interpreter to see
+anything, so profile_in_subprocess() runs it in one and returns the report:
+
+    {
+        "path": "/",
+        "total_seconds": 1.2,
+        "modules": [{"name": ..., "self_seconds": ..., "cumulative_seconds": ...}, ...]
+    }
+
+with the modules that took longest themselves first. A module's self time
+leaves out the modules that it imported.
+"""
+import __builtin__
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from timeit import default_timer
+
+from tracker.boot import PROJECT_DIR, fix_path
+
+
+class ImportTimer(object):
+    """ Times imports while installed in place of __import__ """
+
+    def __init__(self):
+        self.modules = {}
+        # time spent in the imports made by each import in progress
+        self.child_seconds = []
+        self.original_import = None
+
+    def install(self):
+        self.original_import = __builtin__.__import__
+        __builtin__.__import__ = self.timed_import
+
+    def uninstall(self):
+        __builtin__.__import__ = self.original_import
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=None, level=-1):
+        # only the import that first loads a module costs anything
+        candidates = [
+            candidate for candidate in self.candidate_names(name, globals, fromlist, level)
+            if sys.modules.get(candidate) is None
+        ]
+
+        self.child_seconds.append(0)
+        start = default_timer()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            seconds = default_timer() - start
+            child_seconds = self.child_seconds.pop()
+            if self.child_seconds:
+                self.child_seconds[-1] += seconds
+
+            loaded = [
+                candidate for candidate in candidates
+                if sys.modules.get(candidate) is not None
+            ]
+            if loaded and loaded[0] not in self.modules:
+                self.modules[loaded[0]] = {
+                    "name": loaded[0],
+                    "self_seconds": seconds - child_seconds,
+                    "cumulative_seconds": seconds,
+                }
+
+    def candidate_names(self, name, globals, fromlist, level):
+        """ The modules that an import could load, most specific first """
+        names = [name] if name else []
+
+        # Python 2 tries imports relative to the importing package first
+        globals = globals or {}
+        package = globals.get('__package__')
+        if package is None:
+            package = globals.get('__name__', '')
+            if '__path__' not in globals:
+                package = package.rpartition('.')[0]
+
+        if level != 0 and package:
+            if level > 1:
+                package = package.rsplit('.', level - 1)[0]
+            names.insert(0, "{0}.{1}".format(package, name) if name else package)
+
+        # `from package import module`
+        submodules = [
+            "{0}.{1}".format(base, item)
+            for item in fromlist or () if item != '*'
+            for base in names
+        ]
+        return submodules + names
+
+    def report(self):
+        return sorted(self.modules.values(), key=lambda module: module["self_seconds"], reverse=True)
+
+
+def profile_cold_start(path='/'):
+    timer = ImportTimer()
+    start = default_timer()
+    timer.install()
+    try:
+        import tracker.wsgi
+        from django.core.urlresolvers import get_resolver
+        get_resolver(None).resolve(path)
+    finally:
+        timer.uninstall()
+
+    return {
+        "path": path,
+        "total_seconds": default_timer() - start,
+        "modules": timer.report(),
+    }
+
+
+def profile_in_subprocess(path='/', settings_module=None):
+    env = dict(os.environ)
+    env["DJANGO_SETTINGS_MODULE"] = settings_module or env.get(
+        "DJANGO_SETTINGS_MODULE", "tracker.settings")
+
+    handle, output = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    try:
+        subprocess.check_call(
+            [sys.executable, "-m", __name__, path, output], cwd=PROJECT_DIR, env=env)
+        with open(output) as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+
+if __name__ == "__main__":
+    fix_path()
+
+    from djangae import sandbox
+    with sandbox.activate(sandbox.TEST, add_sdk_to_path=True):
+        # Loading the settings reads the app config through ndb, which needs
+        # the datastore and memcache. Their stubs are set up before timing
+        # starts, and stay out of the way of Django's own imports.
+        from google.appengine.ext import testbed
+        bed = testbed.Testbed()
+        bed.activate()
+        try:
+            bed.init_datastore_v3_stub()
+            bed.init_memcache_stub()
+            report = profile_cold_start(sys.argv[1])
+        finally:
+            bed.deactivate()
+
+    with open(sys.argv[2], 'w') as f:
+        json.dump(report, f)
@@ -0,0 +1,55 @@
+"""
+Per-project version stamps used to tell clients when a project has changed.
+
+The stamps live only in memcache so that waiting on them never touches the
+datastore. A stamp that gets evicted is re-seeded from the clock, which means
+a client may see one spurious change but never miss a real one.
+"""
+import time
+
+from django.conf import settings
+from google.appengine.api import memcache
+
+
+def _version_key(project_id):
+    return "project-version:{0}".format(project_id)
+
+
+def _seed_version():
+    return int(time.time() * 1000)
+
+
+def get_project_version(project_id):
+    key = _version_key(project_id)
+    version = memcache.get(key)
+
+    if version is None:
+        # add() rather than set() so we don't clobber a concurrent bump
+        memcache.add(key, _seed_version())
+        version = memcache.get(key)
+
+    return version
+
+
+def bump_project_version(project_id):
+    return memcache.incr(_version_key(project_id), initial_value=_seed_version())
+
+
+def wait_for_project_change(project_id, since, timeout=None, interval=None):
+    """
+    Blocks until the version of the project differs from `since` or the
+    timeout expires, and returns the current version either way.
+    """
+    if timeout is None:
+        timeout = settings.LIVE_POLL_TIMEOUT
+    if interval is None:
+        interval = settings.LIVE_POLL_INTERVAL
+
+    deadline = time.time() + timeout
+    version = get_project_version(project_id)
+
+    while version == since and time.time() < deadline:
+        time.sleep(interval)
+        version = get_project_version(project_id)
+
+    return version
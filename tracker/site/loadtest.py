@@ -0,0 +1,276 @@
+"""
+In-process load testing of the WSGI application.
+
+LoadTest replays a weighted mix of requests against `tracker.wsgi.application`
+from a number of threads, without going through a web server. Each thread is
+a client with its own session cookie, logged in as the same seeded user. The
+result is the throughput and latency percentiles for each URL name, in a form
+that can be written out as JSON and compared between commits.
+
+The datastore and the other services are whatever stubs are active. The
+load_test management command sets up in-memory ones and seeds them with
+seed_data().
+"""
+import Cookie
+import itertools
+import math
+import random
+import threading
+import time
+import urllib
+from cStringIO import StringIO
+from importlib import import_module
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.urlresolvers import resolve, reverse
+
+from .models import Project, Ticket
+
+
+# Weights of each kind of request in the default mix, keyed by URL name
+DEFAULT_MIX = {
+    'my-tickets': 5,
+    'project-list': 2,
+    'project-detail': 5,
+    'ticket-create': 1,
+    'ticket-update': 1,
+    'ticket-delete': 1,
+}
+
+LOAD_TEST_USER_ID = '100000000000000000001'
+LOAD_TEST_USER_EMAIL = 'loadtest@example.com'
+
+
+def parse_mix(value):
+    """ Parses a mix like "my-tickets=5,project-detail=2" into a dict """
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise ValueError("Unknown request type {0}".format(name))
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def percentile(values, fraction):
+    # nearest rank, of an already sorted list
+    rank = int(math.ceil(fraction * len(values)))
+    return values[max(rank, 1) - 1]
+
+
+def seed_data(projects=10, tickets_per_project=50):
+    user = get_user_model().objects.create_user(LOAD_TEST_USER_ID, LOAD_TEST_USER_EMAIL)
+
+    for i in range(projects):
+        project = Project.objects.create(title="Load test project {0}".format(i), created_by=user)
+        for j in range(tickets_per_project):
+            Ticket.objects.create(
+                title="Load test ticket {0}".format(j),
+                description="Seeded by the load test",
+                project=project,
+                created_by=user,
+                # every other ticket is assigned, so my tickets isn't empty
+                assignees=[user] if j % 2 else [],
+            )
+
+    return user
+
+
+class Client(object):
+    """ Makes requests to a WSGI application, keeping its session cookie """
+
+    def __init__(self, application):
+        self.application = application
+        self.cookies = Cookie.SimpleCookie()
+
+    @property
+    def csrf_token(self):
+        # session_csrf keeps the token in the session, which is read here
+        # rather than scraped from a form
+        session_key = self.cookies.get(settings.SESSION_COOKIE_NAME)
+        if session_key is None:
+            return ''
+
+        engine = import_module(settings.SESSION_ENGINE)
+        return engine.SessionStore(session_key.value).get('csrf_token', '')
+
+    def request(self, method, path, data=None):
+        body = urllib.urlencode(data or {}, doseq=True)
+
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'HTTP_COOKIE': self.cookies.output(header='', sep=';').strip(),
+            'wsgi.input': StringIO(body),
+        }
+        setup_testing_defaults(environ)
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = headers
+
+        result = self.application(environ, start_response)
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+        for name, value in response['headers']:
+            if name.lower() == 'set-cookie':
+                self.cookies.load(value)
+
+        return response['status']
+
+
+class LoadTest(object):
+    def __init__(self, application, user, mix=None, concurrency=1, seed=None):
+        self.application = application
+        self.user = user
+        self.mix = mix or DEFAULT_MIX
+        self.concurrency = concurrency
+        self.seed = seed
+
+        self.project_ids = [project.pk for project in Project.objects.all()]
+        self.tickets = [(ticket.pk, ticket.project_id) for ticket in Ticket.objects.all()]
+
+        # tickets that the test created, which are the only ones it deletes
+        self.created = []
+        self.lock = threading.Lock()
+
+        self.timings = {}
+        self.errors = {}
+
+    def choose(self, rng):
+        """ Returns a weighted random request type, and a number to pick its target """
+        point = rng.uniform(0, sum(self.mix.values()))
+        rand = rng.random()
+
+        for name, weight in sorted(self.mix.items()):
+            point -= weight
+            if point <= 0:
+                break
+
+        return name, rand
+
+    def build_request(self, name, client, n, rand):
+        """ Returns the method, path and data of a request of type `name` """
+        if name in ('my-tickets', 'project-list'):
+            return 'GET', reverse(name), None
+
+        project_id = self.project_ids[int(rand * len(self.project_ids))]
+
+        if name == 'project-detail':
+            return 'GET', reverse(name, kwargs={'project_id': project_id}), None
+
+        data = {'csrfmiddlewaretoken': client.csrf_token}
+
+        if name == 'ticket-delete':
+            with self.lock:
+                ticket = self.created.pop() if self.created else None
+            if ticket is None:
+                # nothing to delete yet, so make something to delete later
+                name = 'ticket-create'
+            else:
+                return 'POST', reverse(name, kwargs={
+                    'project_id': ticket[1], 'ticket_id': ticket[0]}), data
+
+        data.update({
+            'title': "Load test {0}".format(n),
+            'description': "Written by the load test",
+            'status': Ticket.OPEN,
+            'assignees': [self.user.pk],
+        })
+
+        if name == 'ticket-create':
+            return 'POST', reverse(name, kwargs={'project_id': project_id}), data
+
+        ticket_id, project_id = self.tickets[int(rand * len(self.tickets))]
+        return 'POST', reverse(name, kwargs={
+            'project_id': project_id, 'ticket_id': ticket_id}), data
+
+    def record(self, method, path, data, status, seconds):
+        url_name = resolve(path).url_name
+        # a form that's posted successfully always redirects
+        failed = status >= 400 or (method == 'POST' and status != 302)
+
+        with self.lock:
+            self.timings.setdefault(url_name, []).append(seconds)
+            if failed:
+                self.errors[url_name] = self.errors.get(url_name, 0) + 1
+
+        if url_name == 'ticket-create' and not failed:
+            # found after the timing, so it isn't part of the result
+            tickets = [
+                (ticket.pk, ticket.project_id)
+                for ticket in Ticket.objects.filter(title=data['title'])
+            ]
+            with self.lock:
+                self.created.extend(tickets)
+
+    def worker(self, index, counter, requests):
+        # each thread has its own generator, so that a seeded run makes the
+        # same choices however the threads are scheduled
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        client = Client(self.application)
+        # the first request starts the session that holds the CSRF token
+        client.request('GET', reverse('my-tickets'))
+
+        while True:
+            n = next(counter)
+            if n >= requests:
+                break
+
+            name, rand = self.choose(rng)
+            method, path, data = self.build_request(name, client, n, rand)
+
+            start = time.time()
+            status = client.request(method, path, data)
+            self.record(method, path, data, status, time.time() - start)
+
+    def run(self, requests):
+        counter = itertools.count()
+        threads = [
+            threading.Thread(target=self.worker, args=(index, counter, requests))
+            for index in range(self.concurrency)
+        ]
+
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.time() - start
+
+        return self.summarise(duration)
+
+    def summarise(self, duration):
+        urls = {}
+        for url_name, timings in self.timings.items():
+            timings = sorted(timings)
+            urls[url_name] = {
+                'requests': len(timings),
+                'errors': self.errors.get(url_name, 0),
+                'requests_per_second': len(timings) / duration,
+                'p50_ms': percentile(timings, 0.5) * 1000,
+                'p95_ms': percentile(timings, 0.95) * 1000,
+                'p99_ms': percentile(timings, 0.99) * 1000,
+            }
+
+        total = sum(url['requests'] for url in urls.values())
+        return {
+            'concurrency': self.concurrency,
+            'mix': self.mix,
+            'requests': total,
+            'duration_seconds': duration,
+            'requests_per_second': total / duration if duration else None,
+            'urls': urls,
+        }
@@ -0,0 +1,66 @@
+import timeit
+from optparse import make_option
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import RequestContext, loader
+from django.template.loader import render_to_string
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from tracker.site.forms import TicketForm
+
+
+TEMPLATE_NAME = 'site/ticket_form.html'
+
+LOADERS = (
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+)
+
+CACHED_LOADERS = (
+    ('django.template.loaders.cached.Loader', LOADERS),
+)
+
+
+class Command(BaseCommand):
+    help = "Times rendering {0} with and without the template and form layout caches.".format(
+        TEMPLATE_NAME)
+
+    option_list = BaseCommand.option_list + (
+        make_option('--iterations', type='int', default=200,
+                    help="Number of renders to time for each case"),
+    )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+
+        def render(rebuild_layout):
+            if rebuild_layout and '_helper' in TicketForm.__dict__:
+                # forget the shared layout, as if it was built per form
+                del TicketForm._helper
+
+            form = TicketForm(candidates=[], title='Create ticket')
+            return render_to_string(
+                TEMPLATE_NAME, {'form': form}, context_instance=RequestContext(request))
+
+        cases = (
+            ("before (uncached templates, layout per form)", LOADERS, True),
+            ("after (cached templates, layout per class)", CACHED_LOADERS, False),
+        )
+
+        for label, loaders, rebuild_layout in cases:
+            with override_settings(TEMPLATE_LOADERS=loaders, TEMPLATE_DEBUG=False):
+                loader.template_source_loaders = None
+
+                # the first render fills the caches being measured
+                render(rebuild_layout)
+                seconds = timeit.timeit(lambda: render(rebuild_layout), number=iterations)
+
+            loader.template_source_loaders = None
+
+            self.stdout.write("{0}: {1:.2f}ms per render".format(
+                label, seconds * 1000 / iterations))
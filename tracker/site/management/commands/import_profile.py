@@ -0,0 +1,41 @@
+import json
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.site.importprofile import profile_in_subprocess
+
+
+class Command(BaseCommand):
+    help = ("Times the imports of a cold start, from importing tracker.wsgi to resolving "
+            "a path, in a new interpreter, and lists the modules that took longest.")
+
+    option_list = BaseCommand.option_list + (
+        make_option('--path', default='/',
+                    help="Path to resolve after importing the WSGI application"),
+        make_option('--top', type='int', default=25,
+                    help="Number of modules to list"),
+        make_option('--output', default=None,
+                    help="File to write the full report to, as JSON"),
+    )
+
+    def handle(self, *args, **options):
+        report = profile_in_subprocess(options['path'])
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+
+        self.stdout.write("{0:<60} {1:>9} {2:>11}".format("Module", "self ms", "cumul. ms"))
+        for module in report['modules'][:options['top']]:
+            self.stdout.write("{0:<60} {1:>9.1f} {2:>11.1f}".format(
+                module['name'], module['self_seconds'] * 1000, module['cumulative_seconds'] * 1000))
+
+        total = report['total_seconds']
+        budget = settings.COLD_START_IMPORT_BUDGET
+        self.stdout.write("{0} modules in {1:.0f}ms, against a budget of {2:.0f}ms".format(
+            len(report['modules']), total * 1000, budget * 1000))
+
+        if total > budget:
+            raise CommandError("Over the cold start budget")
@@ -0,0 +1,83 @@
+import os
+from optparse import make_option
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.site.importer import READERS, ImportFileError, TicketImporter
+from tracker.site.models import Project, TicketImport
+
+
+class Command(BaseCommand):
+    args = '<project_id> <path>'
+    help = (
+        "Imports tickets into a project from a CSV or JSON Lines file. "
+        "Re-running an import with the same name resumes it."
+    )
+
+    option_list = BaseCommand.option_list + (
+        make_option('--format', choices=sorted(READERS.keys()),
+                    help="File format, guessed from the extension by default"),
+        make_option('--name',
+                    help="Name of the import, defaults to the project id and file name"),
+        make_option('--created-by', dest='created_by',
+                    help="Email of the user the tickets are created by"),
+        make_option('--chunk-size', dest='chunk_size', type='int'),
+        make_option('--restart', action='store_true', default=False,
+                    help="Start the import from the beginning of the file"),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 2:
+            raise CommandError("Usage: import_tickets {0}".format(self.args))
+
+        project_id, path = args
+
+        try:
+            project = Project.objects.get(pk=project_id)
+        except (Project.DoesNotExist, ValueError):
+            raise CommandError("Project {0} does not exist".format(project_id))
+
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format not in READERS:
+            raise CommandError("Unknown file format '{0}'".format(file_format))
+
+        created_by = None
+        if options['created_by']:
+            try:
+                created_by = get_user_model().objects.get(email=options['created_by'])
+            except get_user_model().DoesNotExist:
+                raise CommandError("No user with email {0}".format(options['created_by']))
+
+        name = options['name'] or "{0}:{1}".format(project.pk, os.path.basename(path))
+        job, created = TicketImport.objects.get_or_create(
+            name=name,
+            defaults={'project': project, 'created_by': created_by}
+        )
+
+        if options['restart'] and not created:
+            job.delete()
+            job = TicketImport.objects.create(name=name, project=project, created_by=created_by)
+        elif job.finished:
+            self.stdout.write("Import {0} has already finished".format(name))
+            return
+        elif job.committed_rows:
+            self.stdout.write("Resuming import {0} after row {1}".format(name, job.committed_rows))
+
+        importer = TicketImporter(job, chunk_size=options['chunk_size'])
+
+        try:
+            with open(path, 'rb') as f:
+                importer.run(READERS[file_format](f), progress=self.report_progress)
+        except ImportFileError as e:
+            raise CommandError(u"{0}, re-run to resume after row {1}".format(e, job.committed_rows))
+
+        self.stdout.write("Imported {0} tickets, {1} rows failed".format(
+            job.imported_tickets, job.failed_rows))
+
+    def report_progress(self, job, errors):
+        for row_number, row_errors in errors:
+            self.stderr.write(u"Row {0}: {1}".format(row_number, u"; ".join(row_errors)))
+
+        self.stdout.write("{0} rows done, {1} tickets imported".format(
+            job.committed_rows, job.imported_tickets))
@@ -0,0 +1,91 @@
+import json
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from djangae.test_runner import init_testbed
+from google.appengine.datastore import datastore_stub_util
+
+from tracker.site.loadtest import (
+    LOAD_TEST_USER_EMAIL,
+    LOAD_TEST_USER_ID,
+    DEFAULT_MIX,
+    LoadTest,
+    parse_mix,
+    seed_data,
+)
+from tracker.wsgi import application
+
+
+class Command(BaseCommand):
+    help = ("Replays a mix of requests against the WSGI application in this process, "
+            "using in-memory service stubs, and writes the throughput and latency "
+            "percentiles of each URL name to a JSON file.")
+
+    option_list = BaseCommand.option_list + (
+        make_option('--requests', type='int', default=500,
+                    help="Total number of requests to make"),
+        make_option('--concurrency', type='int', default=4,
+                    help="Number of clients making requests at the same time"),
+        make_option('--mix', default=None,
+                    help="Weights of each URL name, e.g. my-tickets=5,ticket-create=1 "
+                         "(default: {0})".format(
+                             ",".join("{0}={1}".format(*item) for item in sorted(DEFAULT_MIX.items())))),
+        make_option('--projects', type='int', default=10,
+                    help="Number of projects to seed"),
+        make_option('--tickets', type='int', default=50,
+                    help="Number of tickets to seed in each project"),
+        make_option('--seed', type='int', default=None,
+                    help="Random seed, to make the same requests in the same order each run"),
+        make_option('--output', default='loadtest.json',
+                    help="File to write the results to"),
+        make_option('--debug', action='store_true', default=False,
+                    help="Keep DEBUG on, which is slower than production"),
+        make_option('--rate-limit', action='store_true', default=False,
+                    help="Keep rate limiting on, which would reject most requests from one user"),
+    )
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix']) if options['mix'] else None
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        bed = init_testbed()
+        try:
+            # the datastore is always consistent, so that the requests
+            # see each other's writes as they would on a quiet instance
+            bed.init_datastore_v3_stub(
+                consistency_policy=datastore_stub_util.PseudoRandomHRConsistencyPolicy(probability=1))
+            bed.setup_env(
+                USER_EMAIL=LOAD_TEST_USER_EMAIL,
+                USER_ID=LOAD_TEST_USER_ID,
+                USER_IS_ADMIN='0',
+                overwrite=True
+            )
+
+            self.stdout.write("Seeding {0} projects with {1} tickets each...".format(
+                options['projects'], options['tickets']))
+            user = seed_data(options['projects'], options['tickets'])
+
+            with override_settings(DEBUG=options['debug'], TEMPLATE_DEBUG=options['debug'],
+                                   RATE_LIMIT_ENABLED=options['rate_limit']):
+                load_test = LoadTest(
+                    application, user, mix=mix,
+                    concurrency=options['concurrency'], seed=options['seed'])
+                results = load_test.run(options['requests'])
+        finally:
+            bed.deactivate()
+
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+        for url_name, url in sorted(results['urls'].items()):
+            self.stdout.write(
+                "{0:<16} {1:>6} req {2:>8.1f} req/s  p50 {3:>7.1f}ms  p95 {4:>7.1f}ms  "
+                "p99 {5:>7.1f}ms  {6} errors".format(
+                    url_name, url['requests'], url['requests_per_second'],
+                    url['p50_ms'], url['p95_ms'], url['p99_ms'], url['errors']))
+
+        self.stdout.write("{0:.1f} req/s overall, written to {1}".format(
+            results['requests_per_second'] or 0, options['output']))
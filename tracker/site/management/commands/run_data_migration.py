@@ -0,0 +1,31 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.site.datamigrations import start_migration, run_migration_sync
+
+
+class Command(BaseCommand):
+    args = '<dotted.path.to.Migration>'
+    help = "Runs a data migration, picking up from its last checkpoint."
+
+    option_list = BaseCommand.option_list + (
+        make_option('--sync', action='store_true', default=False,
+                    help="Run every batch in this process instead of on the task queue"),
+        make_option('--reset', action='store_true', default=False,
+                    help="Discard the checkpoint and start from the beginning"),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError("Usage: run_data_migration {0}".format(self.args))
+
+        path = args[0]
+
+        if options['sync']:
+            state = run_migration_sync(path, reset=options['reset'])
+            self.stdout.write("{0}: {1} entities in {2} batches".format(
+                path, state.processed, state.batches))
+        else:
+            start_migration(path, reset=options['reset'])
+            self.stdout.write("Queued {0}".format(path))
@@ -0,0 +1,36 @@
+"""
+Markdown rendering of ticket descriptions.
+
+Descriptions are rendered and sanitised when a ticket is saved, and the
+result is stored on the ticket, so pages only ever output stored HTML.
+"""
+from HTMLParser import HTMLParser
+
+import bleach
+import markdown
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+ALLOWED_TAGS = [
+    'a', 'abbr', 'blockquote', 'br', 'code', 'em', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'hr', 'li', 'ol', 'p', 'pre', 'strong', 'ul',
+]
+
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title'],
+    'abbr': ['title'],
+}
+
+EXCERPT_LENGTH = 100
+
+
+def render_markdown(text):
+    html = markdown.markdown(text or '', output_format='html5')
+    return bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True)
+
+
+def make_excerpt(html, length=EXCERPT_LENGTH):
+    # plain text, which templates escape as usual
+    text = HTMLParser().unescape(strip_tags(html))
+    return Truncator(u" ".join(text.split())).chars(length)
@@ -0,0 +1,119 @@
+"""
+Memory profiling of views with tracemalloc.
+
+MemoryProfileMiddleware samples requests and records, per URL name, the peak
+memory traced while each sampled request ran and the allocation sites that
+were still holding the most memory when its response was finished. The
+summaries live only in memcache, and are shown to admins on the
+memory-profile page.
+
+PeakMemoryAssertionsMixin is the same measurement for tests, to check that a
+view's peak memory stays under a bound.
+
+tracemalloc is part of Python 3.4+, and needs a patched interpreter on
+Python 2. Without it the middleware turns itself off and the assertions are
+skipped.
+"""
+from google.appengine.api import memcache
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+KEY_PREFIX = "memprofile:"
+URL_NAMES_KEY = "url-names"
+
+
+def start_tracing():
+    tracemalloc.start()
+
+
+def stop_tracing(top=10):
+    """ Stops tracing, and returns the peak in bytes and the top allocation sites """
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # leave out the memory tracemalloc used for itself
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    sites = [
+        {
+            "site": "{0}:{1}".format(stat.traceback[0].filename, stat.traceback[0].lineno),
+            "size": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics('lineno')[:top]
+    ]
+    return peak, sites
+
+
+def measure_peak_memory(func, *args, **kwargs):
+    """ Calls func and returns its result and the peak memory traced while it ran """
+    start_tracing()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        peak, _ = stop_tracing(top=0)
+    return result, peak
+
+
+def record_profile(url_name, peak, sites):
+    # A get and set rather than a compare-and-set, so concurrent samples of
+    # the same URL name can occasionally lose one. They're samples anyway.
+    summary = memcache.get(KEY_PREFIX + url_name) or {
+        "url_name": url_name,
+        "samples": 0,
+        "total_peak": 0,
+        "max_peak": 0,
+        "sites": [],
+    }
+
+    summary["samples"] += 1
+    summary["total_peak"] += peak
+    if peak >= summary["max_peak"]:
+        # the sites of the sample with the highest peak
+        summary["max_peak"] = peak
+        summary["sites"] = sites
+
+    memcache.set(KEY_PREFIX + url_name, summary)
+
+    url_names = memcache.get(KEY_PREFIX + URL_NAMES_KEY) or set()
+    if url_name not in url_names:
+        url_names.add(url_name)
+        memcache.set(KEY_PREFIX + URL_NAMES_KEY, url_names)
+
+
+def get_profiles():
+    """ Returns the summary of each URL name, highest peak first """
+    url_names = memcache.get(KEY_PREFIX + URL_NAMES_KEY) or set()
+    summaries = memcache.get_multi(list(url_names), key_prefix=KEY_PREFIX).values()
+
+    for summary in summaries:
+        summary["mean_peak"] = summary["total_peak"] // summary["samples"]
+
+    return sorted(summaries, key=lambda summary: summary["max_peak"], reverse=True)
+
+
+def clear_profiles():
+    url_names = memcache.get(KEY_PREFIX + URL_NAMES_KEY) or set()
+    memcache.delete_multi(list(url_names) + [URL_NAMES_KEY], key_prefix=KEY_PREFIX)
+
+
+class PeakMemoryAssertionsMixin(object):
+    def assertPeakMemoryBelow(self, limit, func, *args, **kwargs):
+        """
+        Calls func and fails if the memory it allocated peaked at over `limit`
+        bytes. Views that return a TemplateResponse should be rendered inside
+        func, as that's where most of their memory goes.
+        """
+        if tracemalloc is None:
+            self.skipTest("tracemalloc isn't available")
+
+        result, peak = measure_peak_memory(func, *args, **kwargs)
+        if peak > limit:
+            self.fail("Peak memory was {0} bytes, over the limit of {1}".format(peak, limit))
+
+        return result
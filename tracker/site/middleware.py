@@ -0,0 +1,154 @@
+import math
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.urlresolvers import Resolver404, resolve
+from django.http import HttpResponse
+from google.appengine.api import memcache, users
+
+from . import memprofile
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RateLimitMiddleware(object):
+    """
+    Limits how many requests each user, or each IP address when nobody is
+    logged in, can make to each URL name.
+
+    Reads and writes have separate limits, set in RATE_LIMITS by URL name,
+    with RATE_LIMIT_DEFAULTS for the rest, which share one bucket. Each
+    limit is a token bucket of `requests` tokens that refills at `requests`
+    per `period` seconds, so a client can burst up to the limit and then
+    makes requests at the refill rate. A request over the limit gets a 429
+    with Retry-After set to when the next token is due.
+
+    A bucket is the token count and the time it was counted, kept in
+    memcache and updated with compare-and-set. This runs before the session
+    and auth middleware, so a rejected request never touches the datastore.
+    If memcache is unavailable, or the bucket keeps changing under us,
+    requests are let through.
+    """
+    # attempts at updating a bucket before letting the request through
+    CAS_RETRIES = 3
+
+    def process_request(self, request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+
+        # task queue and cron requests are made by App Engine itself, which
+        # strips these headers from anything else
+        if 'HTTP_X_APPENGINE_QUEUENAME' in request.META or 'HTTP_X_APPENGINE_CRON' in request.META:
+            return None
+
+        try:
+            url_name = resolve(request.path_info).url_name
+        except Resolver404:
+            return None
+
+        kind = 'read' if request.method in SAFE_METHODS else 'write'
+
+        limits = settings.RATE_LIMITS.get(url_name, {})
+        if kind in limits:
+            limit = limits[kind]
+        else:
+            # shares a bucket with every other URL name on the default limit
+            url_name = 'default'
+            limit = settings.RATE_LIMIT_DEFAULTS[kind]
+
+        if limit is None:
+            return None
+
+        key = "ratelimit:{0}:{1}:{2}".format(kind, url_name, self.get_client_id(request))
+        wait = self.take_token(key, *limit)
+        if wait is None:
+            return None
+
+        response = HttpResponse("Too many requests", status=429, content_type="text/plain")
+        response['Retry-After'] = str(int(math.ceil(wait)))
+        return response
+
+    def take_token(self, key, requests, period):
+        """
+        Takes a token from the bucket at `key`. Returns None if there was
+        one, or else the seconds until there will be.
+        """
+        rate = float(requests) / period
+        client = memcache.Client()
+
+        for attempt in range(self.CAS_RETRIES):
+            now = time.time()
+            bucket = client.gets(key)
+
+            if bucket is None:
+                # a new bucket starts full. It only expires once it would
+                # have refilled, when it's the same as a new one.
+                if client.add(key, (requests - 1, now), time=period + 1):
+                    return None
+                continue
+
+            tokens, counted_at = bucket
+            tokens = min(requests, tokens + (now - counted_at) * rate)
+            if tokens < 1:
+                return (1 - tokens) / rate
+
+            if client.cas(key, (tokens - 1, now), time=period + 1):
+                return None
+
+        return None
+
+    def get_client_id(self, request):
+        user = users.get_current_user()
+        if user:
+            return "user-{0}".format(user.user_id())
+
+        return "ip-{0}".format(request.META.get('REMOTE_ADDR', ''))
+
+
+class MemoryProfileMiddleware(object):
+    """
+    Traces the memory allocated by MEMORY_PROFILE_SAMPLE_RATE of requests
+    with tracemalloc, and records their peak and top allocation sites per
+    URL name, see tracker.site.memprofile.
+
+    Tracing starts when the view is called and stops after its template has
+    been rendered. tracemalloc traces the whole process, so one request is
+    traced at a time and its peak includes anything that other threads
+    allocated meanwhile. Tracing slows a request down several times over,
+    which is why it's off unless MEMORY_PROFILE_ENABLED is set.
+    """
+    lock = threading.Lock()
+
+    def __init__(self):
+        if memprofile.tracemalloc is None or not settings.MEMORY_PROFILE_ENABLED:
+            raise MiddlewareNotUsed()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        if url_name is None or random.random() >= settings.MEMORY_PROFILE_SAMPLE_RATE:
+            return None
+
+        if memprofile.tracemalloc.is_tracing() or not self.lock.acquire(False):
+            return None
+
+        request.memory_profile_url_name = url_name
+        memprofile.start_tracing()
+        return None
+
+    def process_response(self, request, response):
+        url_name = getattr(request, 'memory_profile_url_name', None)
+        if url_name is None:
+            return response
+
+        try:
+            peak, sites = memprofile.stop_tracing(top=settings.MEMORY_PROFILE_TOP_SITES)
+        finally:
+            del request.memory_profile_url_name
+            self.lock.release()
+
+        memprofile.record_profile(url_name, peak, sites)
+        return response
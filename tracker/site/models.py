@@ -1,19 +1,180 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+from django_extensions.db.fields import CreationDateTimeField
 from django_extensions.db.models import TimeStampedModel
 
-from djangae.fields import RelatedSetField
+from djangae.db import transaction
+from djangae.db.transaction import TransactionFailedError
+from djangae.fields import ListField, RelatedSetField, SetField
+
+from .live import bump_project_version
+from .markup import make_excerpt, render_markdown
 
 
 class Project(TimeStampedModel):
     title = models.CharField(max_length=200)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True)
 
+    # kept up to date by Ticket, so the project list needn't count tickets.
+    # Only increment_ticket_count() writes it, so that saving an instance
+    # loaded before a ticket was added doesn't undo it.
+    ticket_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # attempts at each count change before giving up on contention
+    RETRIES = 3
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def increment_ticket_count(cls, project_id, delta):
+        for attempt in range(cls.RETRIES):
+            try:
+                with transaction.atomic():
+                    project = cls.objects.get(pk=project_id)
+                    # update() rather than save() so that `modified` is left alone
+                    cls.objects.filter(pk=project_id).update(
+                        ticket_count=max((project.ticket_count or 0) + delta, 0))
+                return
+            except cls.DoesNotExist:
+                return
+            except TransactionFailedError:
+                if attempt == cls.RETRIES - 1:
+                    raise
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'ticket_count'
+            ]
+
+        super(Project, self).save(*args, **kwargs)
+
+        # whoever created the project always owns it
+        if self.created_by_id:
+            ProjectMembership.ensure_owner(self.pk, self.created_by_id)
+
+
+class ProjectMembership(models.Model):
+    """
+    A user's role in a project. Saving or deleting one also updates the
+    user's UserProjectIndex, in the same transaction.
+    """
+    OWNER = 'owner'
+    MEMBER = 'member'
+
+    ROLE_CHOICES = (
+        (OWNER, 'Owner'),
+        (MEMBER, 'Member'),
+    )
+
+    # "<project id>:<user id>", so a membership can be fetched by key
+    id = models.CharField(max_length=100, primary_key=True)
+    project = models.ForeignKey(Project, related_name="memberships")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="project_memberships")
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default=MEMBER)
+    created = CreationDateTimeField()
+
+    # attempts at each write before giving up on contention for the index
+    RETRIES = 3
+
+    def __str__(self):
+        return self.id
+
+    @staticmethod
+    def make_id(project_id, user_id):
+        return "{0}:{1}".format(project_id, user_id)
+
+    @classmethod
+    def ensure_owner(cls, project_id, user_id):
+        membership_id = cls.make_id(project_id, user_id)
+        try:
+            membership = cls.objects.get(pk=membership_id)
+        except cls.DoesNotExist:
+            membership = cls(id=membership_id, project_id=project_id, user_id=user_id)
+
+        if membership._state.adding or membership.role != cls.OWNER:
+            membership.role = cls.OWNER
+            membership.save()
+
+    def save(self, *args, **kwargs):
+        self.id = self.make_id(self.project_id, self.user_id)
+
+        for attempt in range(self.RETRIES):
+            try:
+                with transaction.atomic(xg=True):
+                    super(ProjectMembership, self).save(*args, **kwargs)
+                    UserProjectIndex.update(self.user_id, added=self.project_id)
+                return
+            except TransactionFailedError:
+                if attempt == self.RETRIES - 1:
+                    raise
+
+    def delete(self, *args, **kwargs):
+        for attempt in range(self.RETRIES):
+            try:
+                with transaction.atomic(xg=True):
+                    UserProjectIndex.update(self.user_id, removed=self.project_id)
+                    super(ProjectMembership, self).delete(*args, **kwargs)
+                return
+            except TransactionFailedError:
+                if attempt == self.RETRIES - 1:
+                    raise
+
+
+class UserProjectIndex(models.Model):
+    """
+    The ids of the projects a user is a member of, so that they can be read
+    with one get by the user's id. ProjectMembership keeps this up to date.
+    Deleting a project doesn't remove it from here, so readers skip ids that
+    no longer exist.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, primary_key=True, related_name="project_index")
+    project_ids = SetField(models.PositiveIntegerField())
+
+    @classmethod
+    def get_project_ids(cls, user_id):
+        try:
+            return cls.objects.get(pk=user_id).project_ids or set()
+        except cls.DoesNotExist:
+            return set()
+
+    @classmethod
+    def update(cls, user_id, added=None, removed=None):
+        """ Adds or removes a project id, within the caller's transaction """
+        try:
+            index = cls.objects.get(pk=user_id)
+        except cls.DoesNotExist:
+            index = cls(user_id=user_id)
+
+        project_ids = set(index.project_ids or ())
+        if added is not None:
+            project_ids.add(added)
+        if removed is not None:
+            project_ids.discard(removed)
+
+        if project_ids != index.project_ids or index._state.adding:
+            index.project_ids = project_ids
+            index.save()
+
 
 class Ticket(TimeStampedModel):
+    OPEN = 'open'
+    IN_PROGRESS = 'in_progress'
+    CLOSED = 'closed'
+
+    STATUS_CHOICES = (
+        (OPEN, 'Open'),
+        (IN_PROGRESS, 'In progress'),
+        (CLOSED, 'Closed'),
+    )
+
+    # the statuses shown by default, closed tickets are only listed on request
+    ACTIVE_STATUSES = (OPEN, IN_PROGRESS)
+
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     project = models.ForeignKey(Project, related_name="tickets")
@@ -21,6 +182,283 @@ class Ticket(TimeStampedModel):
         settings.AUTH_USER_MODEL, null=True, related_name="created_tickets")
     assignees = RelatedSetField(
         settings.AUTH_USER_MODEL, related_name="tickets")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=OPEN, db_index=True)
+    closed_at = models.DateTimeField(null=True, editable=False)
+
+    # set on save, as the datastore can't filter on an empty assignees list
+    is_unassigned = models.BooleanField(default=True, editable=False, db_index=True)
+
+    # rendered from the description on save, so pages never render Markdown
+    description_html = models.TextField(blank=True, editable=False)
+    description_excerpt = models.TextField(blank=True, editable=False)
+
+    # kept up to date by Comment.save(), so lists can show activity without
+    # loading comments. Only Comment.save() writes them, so that saving an
+    # instance loaded before a comment was added doesn't undo it.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, editable=False)
+    COMMENT_FIELDS = ('comment_count', 'last_comment_at')
+
+    def __init__(self, *args, **kwargs):
+        super(Ticket, self).__init__(*args, **kwargs)
+
+        # the description that description_html was rendered from
+        self._rendered_description = self.__dict__.get('description') if self.pk else None
+
+        # what this ticket counted towards in the workload rollups when it
+        # was loaded, to diff against on save. None if that isn't known
+        # because some of the fields were deferred.
+        if not self.pk:
+            self._saved_workload_keys = set()
+        elif all(f in self.__dict__ for f in ('project_id', 'assignees_ids', 'status')):
+            self._saved_workload_keys = self.workload_keys()
+        else:
+            self._saved_workload_keys = None
 
     def __str__(self):
         return self.title
+
+    def workload_keys(self):
+        return set(
+            (self.project_id, assignee_id, self.status)
+            for assignee_id in self.assignees_ids
+        )
+
+    def render_description(self):
+        self.description_html = render_markdown(self.description)
+        self.description_excerpt = make_excerpt(self.description_html)
+        self._rendered_description = self.description
+
+    def save(self, *args, **kwargs):
+        if self.description != self._rendered_description:
+            self.render_description()
+
+        if self.status == self.CLOSED:
+            self.closed_at = self.closed_at or timezone.now()
+        else:
+            self.closed_at = None
+
+        self.is_unassigned = not self.assignees_ids
+
+        adding = self._state.adding
+        if not adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COMMENT_FIELDS
+            ]
+
+        super(Ticket, self).save(*args, **kwargs)
+
+        keys = self.workload_keys()
+        if self._saved_workload_keys is not None:
+            WorkloadRollup.apply_changes(added=keys - self._saved_workload_keys,
+                                         removed=self._saved_workload_keys - keys)
+        self._saved_workload_keys = keys
+
+        if adding:
+            Project.increment_ticket_count(self.project_id, 1)
+        bump_project_version(self.project_id)
+
+    def delete(self, *args, **kwargs):
+        keep_comments = kwargs.pop('keep_comments', False)
+        project_id = self.project_id
+        ticket_id = self.pk
+        super(Ticket, self).delete(*args, **kwargs)
+
+        # archived tickets keep the ticket's id, and so its comments
+        if not keep_comments:
+            Comment.objects.filter(ticket=ticket_id).delete()
+
+        WorkloadRollup.apply_changes(removed=self._saved_workload_keys or ())
+        self._saved_workload_keys = set()
+
+        Project.increment_ticket_count(project_id, -1)
+        bump_project_version(project_id)
+
+
+class Comment(models.Model):
+    """
+    A comment on a ticket. Comments are only ever added, and each is its own
+    entity so that a busy ticket doesn't grow.
+    """
+    # not cascaded, so that comments outlive their ticket being archived
+    ticket = models.ForeignKey(Ticket, related_name="comments", on_delete=models.DO_NOTHING)
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, related_name="comments")
+    body = models.TextField()
+    body_html = models.TextField(editable=False)
+    created = CreationDateTimeField()
+
+    # attempts at saving before giving up on contention for the ticket
+    RETRIES = 3
+
+    def __str__(self):
+        return self.body
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        self.body_html = render_markdown(self.body)
+
+        for attempt in range(self.RETRIES):
+            try:
+                # the comment and the ticket's count are written together
+                with transaction.atomic(xg=True):
+                    super(Comment, self).save(*args, **kwargs)
+
+                    if adding:
+                        ticket = Ticket.objects.get(pk=self.ticket_id)
+                        # update() rather than save() so that `modified` is left alone
+                        Ticket.objects.filter(pk=ticket.pk).update(
+                            comment_count=(ticket.comment_count or 0) + 1,
+                            last_comment_at=self.created
+                        )
+                break
+            except TransactionFailedError:
+                if attempt == self.RETRIES - 1:
+                    raise
+
+        if adding:
+            bump_project_version(ticket.project_id)
+
+
+class ArchivedTicket(models.Model):
+    """
+    A ticket that has been closed for longer than TICKET_ARCHIVE_AFTER_DAYS.
+    These are moved out of Ticket by tracker.site.datamigrations.ArchiveClosedTickets
+    so that queries and indexes on Ticket only cover active work.
+    """
+    # the same id as the Ticket this was
+    id = models.PositiveIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    description_html = models.TextField(blank=True, editable=False)
+    description_excerpt = models.TextField(blank=True, editable=False)
+    project = models.ForeignKey(Project, related_name="archived_tickets")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, related_name="created_archived_tickets")
+    assignees = RelatedSetField(
+        settings.AUTH_USER_MODEL, related_name="archived_tickets")
+    created = models.DateTimeField()
+    modified = models.DateTimeField()
+    closed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ('-closed_at',)
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def from_ticket(cls, ticket):
+        archived = cls(
+            id=ticket.pk,
+            title=ticket.title,
+            description=ticket.description,
+            description_html=ticket.description_html,
+            description_excerpt=ticket.description_excerpt,
+            project_id=ticket.project_id,
+            created_by_id=ticket.created_by_id,
+            created=ticket.created,
+            modified=ticket.modified,
+            closed_at=ticket.closed_at
+        )
+        archived.assignees_ids = set(ticket.assignees_ids)
+        return archived
+
+
+class PendingAssignmentNotification(models.Model):
+    """
+    The assignees of a ticket that have been notified of their assignment,
+    while changes to them are waiting to be notified. One exists for as long
+    as a task is queued to send them, see tracker.site.notifications.
+    """
+    # the id of the ticket
+    id = models.PositiveIntegerField(primary_key=True)
+    assignee_ids = SetField(models.PositiveIntegerField())
+
+
+class WorkloadRollup(models.Model):
+    """
+    The number of tickets with a status that are assigned to a user in a
+    project. Ticket keeps these up to date as it is saved and deleted, and
+    tracker.site.datamigrations.ReconcileWorkload recounts them periodically.
+    """
+    # "<project id>:<assignee id>:<status>", so a rollup can be fetched by key
+    id = models.CharField(max_length=100, primary_key=True)
+    project = models.ForeignKey(Project, related_name="workload")
+    assignee = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="workload")
+    status = models.CharField(max_length=20, choices=Ticket.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    # attempts at each increment before giving up on contention
+    RETRIES = 3
+
+    @staticmethod
+    def make_id(project_id, assignee_id, status):
+        return "{0}:{1}:{2}".format(project_id, assignee_id, status)
+
+    @classmethod
+    def apply_changes(cls, added=(), removed=()):
+        """ Counts tickets in or out of the (project, assignee, status) keys given """
+        for key in added:
+            cls.increment(key, 1)
+        for key in removed:
+            cls.increment(key, -1)
+
+    @classmethod
+    def increment(cls, key, delta):
+        project_id, assignee_id, status = key
+        rollup_id = cls.make_id(project_id, assignee_id, status)
+
+        for attempt in range(cls.RETRIES):
+            try:
+                with transaction.atomic():
+                    try:
+                        rollup = cls.objects.get(pk=rollup_id)
+                    except cls.DoesNotExist:
+                        rollup = cls(id=rollup_id, project_id=project_id,
+                                     assignee_id=assignee_id, status=status)
+
+                    # never negative, the reconciliation job fixes any drift
+                    rollup.count = max(rollup.count + delta, 0)
+                    rollup.save()
+                return
+            except TransactionFailedError:
+                if attempt == cls.RETRIES - 1:
+                    raise
+
+
+class TicketImport(TimeStampedModel):
+    """ Checkpoint for a bulk ticket import, so that a failed import can resume """
+    # the most row errors kept for the admin to show
+    MAX_ROW_ERRORS = 100
+
+    name = models.CharField(max_length=500, primary_key=True)
+    project = models.ForeignKey(Project, related_name="imports")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, related_name="ticket_imports")
+    committed_rows = models.PositiveIntegerField(default=0)
+    imported_tickets = models.PositiveIntegerField(default=0)
+    failed_rows = models.PositiveIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+
+    # the file uploaded in the admin, which a task imports in the background
+    upload = models.FileField(upload_to="ticket-imports", null=True, editable=False)
+    upload_format = models.CharField(max_length=10, blank=True, editable=False)
+    row_errors = ListField(models.CharField(max_length=500), editable=False)
+    error = models.TextField(blank=True, editable=False)
+
+    def __str__(self):
+        return self.name
+
+
+class MigrationState(TimeStampedModel):
+    """ Checkpoint for a data migration, see tracker.site.datamigrations """
+    name = models.CharField(max_length=500, primary_key=True)
+    cursor = models.CharField(max_length=500, null=True)
+    processed = models.PositiveIntegerField(default=0)
+    batches = models.PositiveIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+
+    def __str__(self):
+        return self.name
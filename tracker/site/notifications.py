@@ -0,0 +1,168 @@
+"""
+Assignment notifications.
+
+Changes to a ticket's assignees aren't sent from the request. The first
+change stores the assignees from before it in a PendingAssignmentNotification
+and queues a deferred task, in the same transaction, to run after
+ASSIGNMENT_NOTIFICATION_DELAY. Further changes find the pending notification
+and queue nothing, so the task diffs the assignees from before the burst
+against the ticket as it is when the task runs. This sends one notification
+per affected user.
+
+The task records each user as notified once they've been sent to, so a
+retry after a failed send starts from that user rather than the first, and
+deletes the pending notification once there's no one left to notify.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from django.core.urlresolvers import reverse
+from django.utils.module_loading import import_string
+from djangae.db import transaction
+from djangae.db.transaction import TransactionFailedError
+from google.appengine.api import app_identity
+from google.appengine.ext import deferred
+
+from .models import PendingAssignmentNotification, Ticket
+
+
+# attempts at each transaction before giving up on contention
+RETRIES = 3
+
+
+def absolute_url(path):
+    # tasks have no request to build the URL from
+    return "https://{0}{1}".format(app_identity.get_default_version_hostname(), path)
+
+
+class EmailNotificationSender(object):
+    def send(self, user, ticket, assigned):
+        if assigned:
+            subject = u"You have been assigned to {0}".format(ticket.title)
+        else:
+            subject = u"You are no longer assigned to {0}".format(ticket.title)
+
+        url = absolute_url(reverse("ticket-update", kwargs={
+            "project_id": ticket.project_id,
+            "ticket_id": ticket.pk
+        }))
+
+        send_mail(subject, url, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+
+class LocalNotificationSender(object):
+    """ Collects notifications in memory instead of sending them, for tests. """
+    outbox = []
+
+    def send(self, user, ticket, assigned):
+        self.outbox.append((user.email, ticket.pk, assigned))
+
+
+def get_sender():
+    return import_string(settings.ASSIGNMENT_NOTIFICATION_SENDER)()
+
+
+def queue_assignment_notifications(ticket, previous_assignee_ids):
+    for attempt in range(RETRIES):
+        try:
+            with transaction.atomic():
+                if PendingAssignmentNotification.objects.filter(pk=ticket.pk).exists():
+                    # an earlier change already queued the notifications
+                    return
+
+                PendingAssignmentNotification.objects.create(
+                    id=ticket.pk, assignee_ids=set(previous_assignee_ids))
+                deferred.defer(
+                    send_assignment_notifications,
+                    ticket.pk,
+                    _countdown=settings.ASSIGNMENT_NOTIFICATION_DELAY,
+                    _queue=settings.ASSIGNMENT_NOTIFICATION_QUEUE,
+                    _transactional=True
+                )
+            return
+        except TransactionFailedError:
+            if attempt == RETRIES - 1:
+                raise
+
+
+def next_to_notify(ticket_id):
+    """
+    Returns the ticket and the id of the next user whose assignment has
+    changed since they were notified. Returns None, and deletes the pending
+    notification, once there's no one left.
+    """
+    for attempt in range(RETRIES):
+        try:
+            # the ticket is read in the transaction, so that a change to it
+            # before this commits is either seen here or queues another task
+            with transaction.atomic(xg=True):
+                try:
+                    pending = PendingAssignmentNotification.objects.get(pk=ticket_id)
+                except PendingAssignmentNotification.DoesNotExist:
+                    return None
+
+                try:
+                    ticket = Ticket.objects.get(pk=ticket_id)
+                except Ticket.DoesNotExist:
+                    # deleted since the change was made, so there's nothing
+                    # to tell anyone
+                    pending.delete()
+                    return None
+
+                changed = set(pending.assignee_ids or ()) ^ set(ticket.assignees_ids)
+                if not changed:
+                    pending.delete()
+                    return None
+
+                return ticket, min(changed)
+        except TransactionFailedError:
+            if attempt == RETRIES - 1:
+                raise
+
+
+def mark_notified(ticket_id, user_id, assigned):
+    for attempt in range(RETRIES):
+        try:
+            with transaction.atomic():
+                try:
+                    pending = PendingAssignmentNotification.objects.get(pk=ticket_id)
+                except PendingAssignmentNotification.DoesNotExist:
+                    return
+
+                notified = set(pending.assignee_ids or ())
+                if assigned:
+                    notified.add(user_id)
+                else:
+                    notified.discard(user_id)
+
+                pending.assignee_ids = notified
+                pending.save()
+            return
+        except TransactionFailedError:
+            if attempt == RETRIES - 1:
+                raise
+
+
+def send_assignment_notifications(ticket_id):
+    User = get_user_model()
+    sender = get_sender()
+
+    while True:
+        result = next_to_notify(ticket_id)
+        if result is None:
+            break
+
+        ticket, user_id = result
+        assigned = user_id in ticket.assignees_ids
+
+        try:
+            user = User.objects.get(pk=user_id)
+        except User.DoesNotExist:
+            user = None
+
+        if user is not None:
+            # a failure here fails the task before the user is marked, so
+            # the retry sends to them again
+            sender.send(user, ticket, assigned=assigned)
+
+        mark_notified(ticket_id, user_id, assigned)
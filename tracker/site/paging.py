@@ -0,0 +1,110 @@
+"""
+Cursor paging for querysets ordered by a single field.
+
+A cursor holds the sort value and key of the last item on a page. The next
+page is whatever sorts after that, using the key to break ties:
+
+    value after cursor value OR (value == cursor value AND key > cursor key)
+
+The datastore only allows an inequality filter on the first sort order, so
+this runs as one query for values from the cursor value onwards, ordered by
+the sort field alone. The datastore orders equal values by key, so the ties
+up to the cursor's key come first and are skipped in memory. Only the ties
+are read twice, so a page costs about the same however deep it is, which
+isn't true of an offset.
+"""
+import base64
+import datetime
+import json
+
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(value, pk):
+    if isinstance(value, datetime.datetime):
+        value = {'dt': value.isoformat()}
+
+    return base64.urlsafe_b64encode(json.dumps([value, pk]))
+
+
+def decode_cursor(cursor):
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(str(cursor)))
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+
+    if isinstance(value, dict):
+        value = parse_datetime(value.get('dt', ''))
+        if value is None:
+            raise InvalidCursor(cursor)
+
+    return value, pk
+
+
+def paginate(queryset, sort, cursor=None, page_size=50):
+    """
+    Returns the page of `queryset` ordered by `sort` (a field name, with a
+    leading '-' for descending) that starts after `cursor`, and the cursor
+    for the page after it, or None if this is the last page.
+    """
+    field = sort.lstrip('-')
+    limit = page_size + 1
+
+    if not cursor:
+        items = list(queryset.order_by(sort)[:limit])
+    else:
+        value, pk = decode_cursor(cursor)
+        lookup = 'lte' if sort.startswith('-') else 'gte'
+        queryset = queryset.filter(**{'{0}__{1}'.format(field, lookup): value}).order_by(sort)
+
+        while True:
+            results = list(queryset[:limit])
+            items = [
+                item for item in results
+                if getattr(item, field) != value or item.pk > pk
+            ]
+            # read further if there were more ties than a page
+            if len(items) >= page_size + 1 or len(results) < limit:
+                break
+            limit *= 2
+
+    return end_page(items, field, page_size)
+
+
+def paginate_list(items, sort, cursor=None, page_size=50):
+    """
+    paginate() for objects that are already in memory, such as the results
+    of a batch get, with the same cursors.
+    """
+    field = sort.lstrip('-')
+    descending = sort.startswith('-')
+
+    # in key order first, so that the stable sort leaves ties in key order
+    # as the datastore would
+    items = sorted(items, key=lambda item: item.pk)
+    items.sort(key=lambda item: getattr(item, field), reverse=descending)
+
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        items = [
+            item for item in items
+            if (getattr(item, field) < value if descending else getattr(item, field) > value)
+            or (getattr(item, field) == value and item.pk > pk)
+        ]
+
+    return end_page(items[:page_size + 1], field, page_size)
+
+
+def end_page(items, field, page_size):
+    """ Trims up to page_size + 1 items to a page, and returns it with the next cursor """
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+
+    return items, next_cursor
@@ -0,0 +1,32 @@
+"""
+Views run by cron. app.yaml restricts /tasks/ to admins, but we check the
+header App Engine adds to cron requests as well in case that ever changes.
+"""
+from functools import wraps
+
+from django.http import HttpResponse, HttpResponseForbidden
+from google.appengine.api import users
+
+from .datamigrations import start_migration
+
+
+def cron_only(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        from_cron = request.META.get('HTTP_X_APPENGINE_CRON') == 'true'
+        if not (from_cron or users.is_current_user_admin()):
+            return HttpResponseForbidden()
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+@cron_only
+def archive_tickets_task(request):
+    start_migration('tracker.site.datamigrations.ArchiveClosedTickets', reset=True)
+    return HttpResponse("Queued")
+
+
+@cron_only
+def reconcile_workload_task(request):
+    start_migration('tracker.site.datamigrations.ReconcileWorkload', reset=True)
+    return HttpResponse("Queued")
@@ -0,0 +1,44 @@
+import json
+
+from django import template
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+register = template.Library()
+
+# manifests are read once per instance, keyed by path
+_manifests = {}
+
+
+def get_manifest(path):
+    if path not in _manifests:
+        try:
+            with open(path) as f:
+                _manifests[path] = json.load(f)
+        except IOError:
+            _manifests[path] = {}
+
+    return _manifests[path]
+
+
+@register.simple_tag
+def static_bundle(name):
+    """
+    Returns the URL of the fingerprinted bundle built by gulp for `name`,
+    e.g. "js/app.js". In debug the unfingerprinted name is used. Otherwise a
+    missing manifest or bundle raises ImproperlyConfigured if
+    STATIC_MANIFEST_REQUIRED is set, as it is live, rather than linking to a
+    file that was never built.
+    """
+    if settings.DEBUG:
+        return settings.STATIC_URL + name
+
+    manifest = get_manifest(settings.STATIC_MANIFEST)
+    if name not in manifest:
+        if settings.STATIC_MANIFEST_REQUIRED:
+            raise ImproperlyConfigured(
+                "{0} isn't in {1}, run `gulp build` before deploying".format(
+                    name, settings.STATIC_MANIFEST))
+        return settings.STATIC_URL + name
+
+    return settings.STATIC_URL + manifest[name]
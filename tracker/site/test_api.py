@@ -0,0 +1,169 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from .api import (
+    batch_api_view,
+    project_api_view,
+    project_list_api_view,
+    ticket_api_view,
+    ticket_list_api_view,
+)
+from .models import Project, Ticket
+
+
+User = get_user_model()
+
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        self.project = Project.objects.create(title='Library Thinger', created_by=self.user)
+
+    def call(self, view, method='get', data=None, user=None, params='', **kwargs):
+        path = '/' + ('?' + params if params else '')
+        if method == 'get':
+            req = self.factory.get(path)
+        else:
+            req = getattr(self.factory, method)(
+                path, json.dumps(data or {}), content_type='application/json')
+        req.user = user or self.user
+
+        resp = view(req, **kwargs)
+        return resp.status_code, json.loads(resp.content)
+
+
+class TicketApiTest(ApiTestCase):
+    def test_create_get_update_delete(self):
+        status, data = self.call(
+            ticket_list_api_view, 'post', {'title': 'task 1', 'assignees': [self.user.pk]},
+            project_id=self.project.pk)
+        self.assertEqual(status, 201)
+        self.assertEqual(data['assignees'], [self.user.pk])
+        ticket_id = data['id']
+
+        status, data = self.call(ticket_api_view, params='fields=title,status', ticket_id=ticket_id)
+        self.assertEqual(status, 200)
+        self.assertEqual(data, {'title': 'task 1', 'status': Ticket.OPEN})
+
+        # fields that aren't given are left as they were
+        status, data = self.call(
+            ticket_api_view, 'put', {'status': Ticket.CLOSED}, ticket_id=ticket_id)
+        self.assertEqual(status, 200)
+        self.assertEqual(data['title'], 'task 1')
+        self.assertEqual(data['status'], Ticket.CLOSED)
+        self.assertEqual(data['assignees'], [self.user.pk])
+
+        status, _ = self.call(ticket_api_view, 'delete', ticket_id=ticket_id)
+        self.assertEqual(status, 200)
+        self.assertFalse(Ticket.objects.filter(pk=ticket_id).exists())
+
+    def test_invalid_data(self):
+        status, data = self.call(
+            ticket_list_api_view, 'post', {'title': ''}, project_id=self.project.pk)
+        self.assertEqual(status, 400)
+        self.assertIn('title', data['errors'])
+
+    def test_unknown_field(self):
+        ticket = Ticket.objects.create(title='task 1', created_by=self.user, project=self.project)
+        status, _ = self.call(ticket_api_view, params='fields=password', ticket_id=ticket.pk)
+        self.assertEqual(status, 400)
+
+    def test_not_found(self):
+        status, _ = self.call(ticket_api_view, ticket_id=12345)
+        self.assertEqual(status, 404)
+
+    def test_write_needs_login(self):
+        status, _ = self.call(
+            ticket_list_api_view, 'post', {'title': 'task 1'},
+            user=AnonymousUser(), project_id=self.project.pk)
+        self.assertEqual(status, 403)
+        self.assertFalse(Ticket.objects.exists())
+
+    @override_settings(API_PAGE_SIZE=1)
+    def test_list_paging(self):
+        for title in ('a', 'b'):
+            Ticket.objects.create(title=title, created_by=self.user, project=self.project)
+
+        status, data = self.call(
+            ticket_list_api_view, params='sort=title&fields=title', project_id=self.project.pk)
+        self.assertEqual(data['objects'], [{'title': 'a'}])
+
+        status, data = self.call(
+            ticket_list_api_view, params='sort=title&fields=title&cursor=' + data['next_cursor'],
+            project_id=self.project.pk)
+        self.assertEqual(data['objects'], [{'title': 'b'}])
+        self.assertIsNone(data['next_cursor'])
+
+
+class ProjectApiTest(ApiTestCase):
+    def test_members_only(self):
+        other = User.objects.create_user('nice person', 'niceperson@example.com')
+
+        status, _ = self.call(project_api_view, user=other, project_id=self.project.pk)
+        self.assertEqual(status, 403)
+
+        status, data = self.call(project_list_api_view, user=other)
+        self.assertEqual(data['objects'], [])
+
+        status, data = self.call(project_list_api_view, params='fields=title')
+        self.assertEqual(data['objects'], [{'title': 'Library Thinger'}])
+
+    @override_settings(API_PAGE_SIZE=1)
+    def test_list_paging(self):
+        Project.objects.create(title='Burping Competition', created_by=self.user)
+
+        status, data = self.call(project_list_api_view, params='sort=title&fields=title')
+        self.assertEqual(data['objects'], [{'title': 'Burping Competition'}])
+
+        status, data = self.call(
+            project_list_api_view, params='sort=title&fields=title&cursor=' + data['next_cursor'])
+        self.assertEqual(data['objects'], [{'title': 'Library Thinger'}])
+        self.assertIsNone(data['next_cursor'])
+
+        status, _ = self.call(project_list_api_view, params='cursor=not-a-cursor')
+        self.assertEqual(status, 400)
+
+    def test_delete_with_tickets(self):
+        Ticket.objects.create(title='task 1', created_by=self.user, project=self.project)
+
+        status, _ = self.call(project_api_view, 'delete', project_id=self.project.pk)
+        self.assertEqual(status, 409)
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+
+
+class BatchApiTest(ApiTestCase):
+    def test_operations(self):
+        ticket = Ticket.objects.create(title='task 1', created_by=self.user, project=self.project)
+
+        status, data = self.call(batch_api_view, 'post', {'operations': [
+            {'method': 'get', 'type': 'project', 'id': self.project.pk, 'fields': ['title']},
+            {'method': 'update', 'type': 'ticket', 'id': ticket.pk, 'data': {'title': 'task 2'},
+             'fields': ['title']},
+            {'method': 'create', 'type': 'ticket', 'project': self.project.pk,
+             'data': {'title': 'task 3'}, 'fields': ['title']},
+            {'method': 'get', 'type': 'ticket', 'id': 12345},
+            {'method': 'frobnicate', 'type': 'ticket', 'id': ticket.pk},
+        ]})
+
+        self.assertEqual(status, 200)
+        results = data['results']
+        self.assertEqual(results[0], {'status': 200, 'data': {'title': 'Library Thinger'}})
+        self.assertEqual(results[1], {'status': 200, 'data': {'title': 'task 2'}})
+        self.assertEqual(results[2], {'status': 201, 'data': {'title': 'task 3'}})
+        self.assertEqual(results[3]['status'], 404)
+        self.assertEqual(results[4]['status'], 400)
+
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).title, 'task 2')
+
+    @override_settings(API_BATCH_LIMIT=1)
+    def test_too_many_operations(self):
+        status, _ = self.call(batch_api_view, 'post', {'operations': [
+            {'method': 'get', 'type': 'project', 'id': self.project.pk},
+        ] * 2})
+        self.assertEqual(status, 400)
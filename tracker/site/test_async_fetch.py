@@ -0,0 +1,32 @@
+import threading
+
+from django.http import Http404
+from django.test import TestCase
+
+from .async_fetch import fetch_async
+
+
+class FetchAsyncTest(TestCase):
+    def test_result(self):
+        future = fetch_async(lambda a, b=0: a + b, 1, b=2)
+        self.assertEqual(future.get_result(), 3)
+
+    def test_exception_raised_on_get_result(self):
+        def fetch():
+            raise Http404()
+
+        future = fetch_async(fetch)
+        with self.assertRaises(Http404):
+            future.get_result()
+
+    def test_fetches_run_together(self):
+        # each fetch waits for the other to start, so this only finishes
+        # if they run at the same time
+        first, second = threading.Event(), threading.Event()
+
+        def fetch(started, other):
+            started.set()
+            return other.wait(5)
+
+        futures = [fetch_async(fetch, first, second), fetch_async(fetch, second, first)]
+        self.assertEqual([f.get_result() for f in futures], [True, True])
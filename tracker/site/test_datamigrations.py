@@ -0,0 +1,204 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from .datamigrations import ArchiveClosedTickets, DataMigration, run_batch, run_migration_sync
+from .models import (
+    ArchivedTicket,
+    Comment,
+    MigrationState,
+    Project,
+    ProjectMembership,
+    Ticket,
+    UserProjectIndex,
+    WorkloadRollup,
+)
+
+
+User = get_user_model()
+
+
+class UppercaseTitles(DataMigration):
+    model = Ticket
+    batch_size = 2
+
+    def migrate_entity(self, ticket):
+        ticket.title = ticket.title.upper()
+        ticket.save()
+
+
+MIGRATION = 'tracker.site.test_datamigrations.UppercaseTitles'
+
+
+class DataMigrationTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        project = Project.objects.create(title='Library Thinger', created_by=user)
+
+        for i in range(5):
+            Ticket.objects.create(title='task {0}'.format(i), project=project)
+
+    def test_sync_run(self):
+        state = run_migration_sync(MIGRATION)
+
+        self.assertTrue(state.finished)
+        self.assertEqual(state.processed, 5)
+        self.assertEqual(state.batches, 3)
+        self.assertTrue(all(t.title.startswith('TASK') for t in Ticket.objects.all()))
+
+    def test_resumes_from_checkpoint(self):
+        state = run_batch(MIGRATION)
+        self.assertEqual(state.processed, 2)
+        self.assertFalse(state.finished)
+
+        migrated = set(t.pk for t in Ticket.objects.all() if t.title.startswith('TASK'))
+        self.assertEqual(len(migrated), 2)
+
+        state = run_migration_sync(MIGRATION)
+        self.assertEqual(state.processed, 5)
+        self.assertEqual(MigrationState.objects.get(pk=MIGRATION).batches, 3)
+
+
+class BackfillUnassignedFlagTest(TestCase):
+    def test_backfill(self):
+        user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        project = Project.objects.create(title='Library Thinger')
+        assigned = Ticket.objects.create(title='task 1', project=project, assignees=[user])
+        unassigned = Ticket.objects.create(title='task 2', project=project)
+        # as saved before the flag was stored
+        Ticket.objects.filter(pk=assigned.pk).update(is_unassigned=True)
+        Ticket.objects.filter(pk=unassigned.pk).update(is_unassigned=False)
+
+        run_migration_sync('tracker.site.datamigrations.BackfillUnassignedFlag')
+
+        self.assertFalse(Ticket.objects.get(pk=assigned.pk).is_unassigned)
+        self.assertTrue(Ticket.objects.get(pk=unassigned.pk).is_unassigned)
+
+
+class RenderTicketDescriptionsTest(TestCase):
+    def test_backfill(self):
+        project = Project.objects.create(title='Library Thinger')
+        ticket = Ticket.objects.create(title='task 1', description='*old*', project=project)
+        # as saved before descriptions were rendered
+        Ticket.objects.filter(pk=ticket.pk).update(description_html='', description_excerpt='')
+
+        run_migration_sync('tracker.site.datamigrations.RenderTicketDescriptions')
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        self.assertEqual(ticket.description_html, '<p><em>old</em></p>')
+        self.assertEqual(ticket.description_excerpt, 'old')
+
+
+class BackfillCommentCountsTest(TestCase):
+    def test_recount(self):
+        project = Project.objects.create(title='Library Thinger')
+        ticket = Ticket.objects.create(title='task 1', project=project)
+        comment = Comment.objects.create(ticket=ticket, body='first')
+        Ticket.objects.filter(pk=ticket.pk).update(comment_count=0, last_comment_at=None)
+
+        run_migration_sync('tracker.site.datamigrations.BackfillCommentCounts')
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        self.assertEqual(ticket.comment_count, 1)
+        self.assertEqual(ticket.last_comment_at, comment.created)
+
+
+class BackfillProjectTicketCountsTest(TestCase):
+    def test_recount(self):
+        project = Project.objects.create(title='Library Thinger')
+        Ticket.objects.create(title='task 1', project=project)
+        Project.objects.filter(pk=project.pk).update(ticket_count=0)
+
+        run_migration_sync('tracker.site.datamigrations.BackfillProjectTicketCounts')
+
+        self.assertEqual(Project.objects.get(pk=project.pk).ticket_count, 1)
+
+
+class BackfillProjectMembershipsTest(TestCase):
+    def test_backfill(self):
+        owner = User.objects.create_user('cool guy', 'coolguy@example.com')
+        assignee = User.objects.create_user('nice person', 'niceperson@example.com')
+
+        project = Project.objects.create(title='Library Thinger')
+        Ticket.objects.create(title='task 1', project=project, created_by=owner, assignees=[assignee])
+        # as saved before there were members
+        Project.objects.filter(pk=project.pk).update(created_by=owner)
+
+        run_migration_sync('tracker.site.datamigrations.BackfillProjectMemberships')
+
+        roles = dict(
+            (membership.user_id, membership.role)
+            for membership in ProjectMembership.objects.filter(project=project)
+        )
+        self.assertEqual(roles, {
+            owner.pk: ProjectMembership.OWNER,
+            assignee.pk: ProjectMembership.MEMBER,
+        })
+        self.assertEqual(UserProjectIndex.get_project_ids(assignee.pk), set([project.pk]))
+
+
+@override_settings(TICKET_ARCHIVE_AFTER_DAYS=30)
+class ArchiveClosedTicketsTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title='Library Thinger')
+
+        self.open_ticket = Ticket.objects.create(title='open', project=self.project)
+        self.recently_closed = Ticket.objects.create(
+            title='recently closed', project=self.project, status=Ticket.CLOSED)
+        self.long_closed = Ticket.objects.create(
+            title='long closed', description='*done*', project=self.project,
+            status=Ticket.CLOSED)
+
+        # save() sets closed_at to now, so backdate it directly
+        Ticket.objects.filter(pk=self.long_closed.pk).update(
+            closed_at=timezone.now() - timedelta(days=31))
+
+    def test_archive(self):
+        run_migration_sync('tracker.site.datamigrations.ArchiveClosedTickets')
+
+        self.assertItemsEqual(
+            [t.pk for t in Ticket.objects.all()],
+            [self.open_ticket.pk, self.recently_closed.pk]
+        )
+
+        archived = ArchivedTicket.objects.get(pk=self.long_closed.pk)
+        self.assertEqual(archived.title, 'long closed')
+        self.assertEqual(archived.description_html, '<p><em>done</em></p>')
+        self.assertEqual(archived.description_excerpt, 'done')
+        self.assertEqual(list(self.project.archived_tickets.all()), [archived])
+
+    def test_reopened_after_batch_read(self):
+        stale = Ticket.objects.get(pk=self.long_closed.pk)
+
+        ticket = Ticket.objects.get(pk=self.long_closed.pk)
+        ticket.status = Ticket.OPEN
+        ticket.save()
+
+        ArchiveClosedTickets().migrate_batch([stale])
+
+        self.assertTrue(Ticket.objects.filter(pk=ticket.pk).exists())
+        self.assertFalse(ArchivedTicket.objects.filter(pk=ticket.pk).exists())
+
+
+class ReconcileWorkloadTest(TestCase):
+    def test_reconcile(self):
+        user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        project = Project.objects.create(title='Library Thinger', created_by=user)
+        Ticket.objects.create(title='task 1', project=project, assignees=[user])
+
+        # drift the rollups away from the tickets
+        rollup_id = WorkloadRollup.make_id(project.pk, user.pk, Ticket.OPEN)
+        WorkloadRollup.objects.filter(pk=rollup_id).update(count=5)
+        WorkloadRollup.objects.create(
+            id=WorkloadRollup.make_id(project.pk, user.pk, Ticket.CLOSED),
+            project=project, assignee=user, status=Ticket.CLOSED, count=2)
+
+        run_migration_sync('tracker.site.datamigrations.ReconcileWorkload')
+
+        self.assertEqual(
+            [(r.pk, r.count) for r in WorkloadRollup.objects.all()],
+            [(rollup_id, 1)]
+        )
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from .forms import ProjectForm, TicketForm
+from .models import Project, ProjectMembership
+
+
+User = get_user_model()
+
+
+class BaseTrackerFormTest(TestCase):
+    def test_placeholders_set_on_class(self):
+        self.assertEqual(
+            ProjectForm.base_fields['title'].widget.attrs['placeholder'],
+            ProjectForm.base_fields['title'].label)
+
+        form = ProjectForm()
+        self.assertEqual(
+            form.fields['title'].widget.attrs['placeholder'],
+            form.fields['title'].label)
+
+    def test_layout_shared_between_instances(self):
+        first = TicketForm(candidates=[], title='Create ticket')
+        second = TicketForm(candidates=[], title='Edit ticket')
+
+        self.assertIsNot(first.helper, second.helper)
+        self.assertIs(first.helper.form, first)
+        # the title is the only layout object that isn't shared
+        self.assertEqual(first.helper.layout.fields[1:], second.helper.layout.fields[1:])
+        self.assertIn('Create ticket', first.helper.layout.fields[0].html)
+        self.assertIn('Edit ticket', second.helper.layout.fields[0].html)
+
+    def test_no_title(self):
+        form = TicketForm(candidates=[])
+        self.assertEqual(
+            list(form.helper.layout.fields), list(TicketForm._helper.layout.fields))
+
+
+class ProjectFormTest(TestCase):
+    def test_editing_keeps_creator(self):
+        creator = User.objects.create_user('cool guy', 'coolguy@example.com')
+        editor = User.objects.create_user('nice person', 'niceperson@example.com')
+        project = Project.objects.create(title='Library Thinger', created_by=creator)
+        ProjectMembership.objects.create(project=project, user=editor)
+
+        form = ProjectForm(data={'title': 'Burping Competition'}, instance=project, user=editor)
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        self.assertEqual(Project.objects.get(pk=project.pk).created_by, creator)
+        membership = ProjectMembership.objects.get(
+            pk=ProjectMembership.make_id(project.pk, editor.pk))
+        self.assertEqual(membership.role, ProjectMembership.MEMBER)
@@ -0,0 +1,179 @@
+import shutil
+import tempfile
+from StringIO import StringIO
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from djangae.test import TestCase as TaskTestCase
+
+from .admin import TicketImportAdmin
+from .importer import TicketImporter, read_csv, read_jsonl
+from .models import Project, Ticket, TicketImport
+
+
+User = get_user_model()
+
+
+class TicketImporterTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user('first user', 'user1@example.com')
+        self.user2 = User.objects.create_user('second user', 'user2@example.com')
+
+        self.project = Project.objects.create(
+            title='Library Thinger',
+            created_by=self.user1
+        )
+
+        self.job = TicketImport.objects.create(
+            name='test import',
+            project=self.project,
+            created_by=self.user1
+        )
+
+    def test_csv_import(self):
+        f = StringIO(
+            "title,description,assignees\n"
+            "ticket 1,first,user1@example.com user2@example.com\n"
+            "ticket 2,,\n"
+        )
+
+        TicketImporter(self.job).run(read_csv(f))
+
+        t1 = Ticket.objects.get(title='ticket 1')
+        self.assertEqual(t1.project, self.project)
+        self.assertEqual(t1.created_by, self.user1)
+        self.assertEqual(t1.assignees_ids, set([self.user1.pk, self.user2.pk]))
+        self.assertEqual(Ticket.objects.get(title='ticket 2').assignees_ids, set())
+
+        job = TicketImport.objects.get(pk=self.job.pk)
+        self.assertTrue(job.finished)
+        self.assertEqual(job.imported_tickets, 2)
+
+    def test_invalid_rows_reported(self):
+        f = StringIO(
+            '{"title": "ticket 1", "assignees": ["nobody@example.com"]}\n'
+            '{"description": "no title"}\n'
+            '{"title": "ticket 3", "assignees": ["USER2@example.com"]}\n'
+        )
+        errors = []
+
+        TicketImporter(self.job).run(
+            read_jsonl(f), progress=lambda job, chunk_errors: errors.extend(chunk_errors))
+
+        self.assertEqual([row for row, _ in errors], [1, 2])
+        self.assertEqual([t.title for t in Ticket.objects.all()], ['ticket 3'])
+        self.assertEqual(self.job.failed_rows, 2)
+
+    def test_assignees_resolved_in_batches(self):
+        users = [
+            User.objects.create_user('user {0}'.format(i), 'batch{0}@example.com'.format(i))
+            for i in range(20)
+        ]
+        f = StringIO(
+            '{"title": "ticket 1", "assignees": [%s]}\n'
+            % ', '.join('"BATCH{0}@example.com"'.format(i) for i in range(20))
+        )
+
+        TicketImporter(self.job).run(read_jsonl(f))
+
+        self.assertEqual(
+            Ticket.objects.get(title='ticket 1').assignees_ids,
+            set(user.pk for user in users)
+        )
+
+    def test_resume_skips_committed_rows(self):
+        rows = [{'title': 'ticket {0}'.format(i)} for i in range(5)]
+
+        self.job.committed_rows = 3
+        self.job.save()
+
+        TicketImporter(self.job, chunk_size=2).run(iter(rows))
+
+        self.assertItemsEqual(
+            [t.title for t in Ticket.objects.all()],
+            ['ticket 3', 'ticket 4']
+        )
+        self.assertEqual(self.job.committed_rows, 5)
+
+
+class UploadImportTest(TaskTestCase):
+    def setUp(self):
+        super(UploadImportTest, self).setUp()
+        self.media_root = tempfile.mkdtemp()
+        storage = override_settings(
+            DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+            MEDIA_ROOT=self.media_root,
+            TICKET_IMPORT_QUEUE='default'
+        )
+        storage.enable()
+        self.addCleanup(storage.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+        self.user = User.objects.create_user('first user', 'user1@example.com')
+        self.user.is_staff = True
+        self.user.save()
+
+        self.project = Project.objects.create(
+            title='Library Thinger',
+            created_by=self.user
+        )
+        self.admin = TicketImportAdmin(TicketImport, admin.site)
+
+    def upload(self, content, file_format='jsonl'):
+        req = RequestFactory().post('/admin/site/ticketimport/upload/', {
+            'project': self.project.pk,
+            'file': SimpleUploadedFile('tickets.' + file_format, content),
+            'format': file_format,
+        })
+        req.user = self.user
+        req._messages = CookieStorage(req)
+        return self.admin.upload_view(req)
+
+    def test_imported_by_task(self):
+        resp = self.upload(
+            'title,assignees\n'
+            'ticket 1,user1@example.com\n'
+            'ticket 2,nobody@example.com\n',
+            file_format='csv'
+        )
+
+        self.assertEqual(resp.status_code, 302)
+        self.assertIn('/admin/site/ticketimport/', resp['Location'])
+        self.assertEqual(Ticket.objects.count(), 0)
+        self.assertNumTasksEquals(1)
+
+        self.process_task_queues()
+
+        self.assertEqual([t.title for t in Ticket.objects.all()], ['ticket 1'])
+        job = TicketImport.objects.get()
+        self.assertTrue(job.finished)
+        self.assertEqual(job.row_errors, [u"Row 2: assignees: unknown user nobody@example.com"])
+
+    def test_bad_file_resumed_by_uploading_again(self):
+        self.upload('{"title": "ticket 1"}\n{"title": \n')
+        self.process_task_queues()
+
+        job = TicketImport.objects.get()
+        self.assertFalse(job.finished)
+        self.assertEqual(job.error, "Line 2 is not valid JSON")
+
+        self.upload('{"title": "ticket 1"}\n{"title": "ticket 2"}\n')
+        self.process_task_queues()
+
+        job = TicketImport.objects.get()
+        self.assertTrue(job.finished)
+        self.assertEqual(job.error, '')
+        self.assertItemsEqual(
+            [t.title for t in Ticket.objects.all()], ['ticket 1', 'ticket 2'])
+
+    def test_upload_while_importing_rejected(self):
+        self.upload('{"title": "ticket 1"}\n')
+        self.upload('{"title": "ticket 1"}\n')
+
+        self.assertNumTasksEquals(1)
@@ -0,0 +1,79 @@
+import sys
+
+from django.conf import settings
+from django.conf.urls import patterns, url
+from django.core.urlresolvers import Resolver404, reverse
+from django.http import HttpResponse
+from django.test import TestCase
+
+from tracker.lazy_urls import lazy_include
+
+from .importprofile import ImportTimer, profile_in_subprocess
+
+
+class ImportTimerTest(TestCase):
+    def test_times_first_import(self):
+        sys.modules.pop('tabnanny', None)
+
+        timer = ImportTimer()
+        timer.install()
+        try:
+            import tabnanny
+            import tabnanny
+        finally:
+            timer.uninstall()
+
+        modules = dict((module['name'], module) for module in timer.report())
+        self.assertIn('tabnanny', modules)
+        self.assertLessEqual(
+            modules['tabnanny']['self_seconds'], modules['tabnanny']['cumulative_seconds'])
+
+
+class LazyIncludeTest(TestCase):
+    def test_loaded_on_first_match(self):
+        loads = []
+
+        def urlconf():
+            loads.append(True)
+            return patterns('', url(r'^thing/$', lambda request: HttpResponse(), name='lazy-thing'))
+
+        resolver = lazy_include(r'^lazy/', urlconf)
+
+        with self.assertRaises(Resolver404):
+            resolver.resolve('other/')
+        self.assertEqual(loads, [])
+
+        self.assertEqual(resolver.resolve('lazy/thing/').url_name, 'lazy-thing')
+        resolver.resolve('lazy/thing/')
+        self.assertEqual(loads, [True])
+
+    def test_loaded_for_namespaced_reverse(self):
+        def urlconf():
+            return patterns('', url(r'^thing/$', lambda request: HttpResponse(), name='lazy-thing'))
+
+        resolver = lazy_include(r'^lazy/', urlconf, namespace='lazy')
+
+        # what reverse() reads for a name in the namespace
+        self.assertEqual([p.name for p in resolver.url_patterns], ['lazy-thing'])
+
+
+class ColdStartTest(TestCase):
+    def test_csp_report_uri(self):
+        # fixed in the settings, so that it doesn't load cspreports.urls
+        self.assertEqual(reverse('report_csp'), settings.CSP_REPORT_URI)
+
+    def test_import_budget(self):
+        report = profile_in_subprocess('/')
+        names = set(module['name'] for module in report['modules'])
+
+        # loaded on first use instead, see tracker.urls
+        self.assertNotIn('tracker.site.admin', names)
+        self.assertNotIn('cspreports.urls', names)
+
+        slowest = ", ".join(
+            "{0} {1:.0f}ms".format(module['name'], module['self_seconds'] * 1000)
+            for module in report['modules'][:10]
+        )
+        self.assertLessEqual(
+            report['total_seconds'], settings.COLD_START_IMPORT_BUDGET,
+            "Cold start imports took {0:.2f}s, slowest: {1}".format(report['total_seconds'], slowest))
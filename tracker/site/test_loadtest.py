@@ -0,0 +1,53 @@
+from django.test import TestCase
+from google.appengine.ext import testbed
+
+from tracker.wsgi import application
+
+from .loadtest import (
+    LOAD_TEST_USER_EMAIL,
+    LOAD_TEST_USER_ID,
+    LoadTest,
+    parse_mix,
+    percentile,
+    seed_data,
+)
+
+
+class LoadTestTest(TestCase):
+    def test_percentile(self):
+        values = range(1, 101)
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('my-tickets=5,project-list'), {'my-tickets': 5, 'project-list': 1})
+
+        with self.assertRaises(ValueError):
+            parse_mix('admin=1')
+
+    def test_run(self):
+        # logged in as the seeded user, as the load_test command is
+        bed = testbed.Testbed()
+        bed.activate()
+        self.addCleanup(bed.deactivate)
+        bed.setup_env(
+            USER_EMAIL=LOAD_TEST_USER_EMAIL,
+            USER_ID=LOAD_TEST_USER_ID,
+            USER_IS_ADMIN='0',
+            overwrite=True
+        )
+
+        user = seed_data(projects=2, tickets_per_project=2)
+
+        load_test = LoadTest(
+            application, user, mix={'project-list': 1, 'project-detail': 1},
+            concurrency=2, seed=1)
+        results = load_test.run(10)
+
+        self.assertEqual(results['requests'], 10)
+        self.assertEqual(
+            sum(url['requests'] for url in results['urls'].values()), 10)
+        for url in results['urls'].values():
+            self.assertEqual(url['errors'], 0)
+            self.assertLessEqual(url['p50_ms'], url['p99_ms'])
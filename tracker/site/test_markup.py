@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from .markup import make_excerpt, render_markdown
+from .models import Project, Ticket
+
+
+User = get_user_model()
+
+
+class MarkupTest(TestCase):
+    def test_render(self):
+        self.assertEqual(render_markdown('Some *emphasis*'), '<p>Some <em>emphasis</em></p>')
+
+    def test_render_sanitised(self):
+        html = render_markdown('<script>alert(1)</script>[link](javascript:alert(1))')
+        self.assertNotIn('<script', html)
+        self.assertNotIn('javascript:', html)
+
+    def test_excerpt(self):
+        self.assertEqual(make_excerpt('<p>Fish &amp; <em>chips</em></p>\n<p>Peas</p>'), u'Fish & chips Peas')
+        self.assertEqual(len(make_excerpt('<p>{0}</p>'.format('a' * 500))), 100)
+
+
+class TicketDescriptionTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        self.project = Project.objects.create(title='Library Thinger', created_by=user)
+
+    def test_rendered_on_save(self):
+        ticket = Ticket.objects.create(
+            title='task 1', description='**Urgent**', project=self.project)
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        self.assertEqual(ticket.description_html, '<p><strong>Urgent</strong></p>')
+        self.assertEqual(ticket.description_excerpt, 'Urgent')
+
+        ticket.description = 'Not urgent'
+        ticket.save()
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).description_excerpt, 'Not urgent')
@@ -0,0 +1,75 @@
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed, PermissionDenied
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from google.appengine.api import memcache
+
+from .memprofile import (
+    PeakMemoryAssertionsMixin,
+    clear_profiles,
+    get_profiles,
+    record_profile,
+    tracemalloc,
+)
+from .middleware import MemoryProfileMiddleware
+from .models import Project, Ticket
+from .views import memory_profile_view, project_view
+
+
+User = get_user_model()
+
+# the most the project page may allocate for a project with 200 tickets
+PROJECT_VIEW_PEAK_LIMIT = 8 * 1024 * 1024
+
+
+class MemoryProfileTest(TestCase):
+    def setUp(self):
+        memcache.flush_all()
+
+    def test_summary_per_url_name(self):
+        record_profile('project-detail', 100, [{'site': 'a.py:1', 'size': 50, 'count': 1}])
+        record_profile('project-detail', 300, [{'site': 'b.py:2', 'size': 200, 'count': 2}])
+        record_profile('my-tickets', 50, [])
+
+        profiles = get_profiles()
+        self.assertEqual([p['url_name'] for p in profiles], ['project-detail', 'my-tickets'])
+        self.assertEqual(profiles[0]['samples'], 2)
+        self.assertEqual(profiles[0]['mean_peak'], 200)
+        self.assertEqual(profiles[0]['max_peak'], 300)
+        self.assertEqual(profiles[0]['sites'][0]['site'], 'b.py:2')
+
+        clear_profiles()
+        self.assertEqual(get_profiles(), [])
+
+    @override_settings(MEMORY_PROFILE_ENABLED=False)
+    def test_middleware_off_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            MemoryProfileMiddleware()
+
+    def test_report_admin_only(self):
+        req = RequestFactory().get('/')
+        with self.assertRaises(PermissionDenied):
+            memory_profile_view(req)
+
+
+class ProjectViewMemoryTest(PeakMemoryAssertionsMixin, TestCase):
+    # skipped before seeding, rather than by the assertion afterwards
+    @skipIf(tracemalloc is None, "tracemalloc isn't available")
+    def test_project_view_peak(self):
+        user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        project = Project.objects.create(title='Library Thinger', created_by=user)
+        for i in range(200):
+            Ticket.objects.create(
+                title='task {0}'.format(i), description='*do* it', project=project,
+                created_by=user, assignees=[user])
+
+        req = RequestFactory().get('/')
+        req.user = user
+
+        self.assertPeakMemoryBelow(
+            PROJECT_VIEW_PEAK_LIMIT,
+            lambda: project_view(req, project_id=project.pk).render()
+        )
@@ -0,0 +1,73 @@
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from google.appengine.api import memcache
+
+from .middleware import RateLimitMiddleware
+
+
+@override_settings(
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMIT_DEFAULTS={'read': (3, 60), 'write': (1, 60)},
+    RATE_LIMITS={'project-list': {'read': (2, 60)}, 'project-updates': {'read': None}},
+)
+class RateLimitMiddlewareTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = RateLimitMiddleware()
+        memcache.flush_all()
+
+    def request(self, path, method='get', **extra):
+        req = getattr(self.factory, method)(path, **extra)
+        return self.middleware.process_request(req)
+
+    def test_limit_per_url_name(self):
+        self.assertIsNone(self.request('/projects/'))
+        self.assertIsNone(self.request('/projects/'))
+
+        resp = self.request('/projects/')
+        self.assertEqual(resp.status_code, 429)
+        # a token is due every 30 seconds
+        self.assertTrue(0 < int(resp['Retry-After']) <= 30)
+
+        # other URL names have their own count
+        self.assertIsNone(self.request('/'))
+
+    def test_reads_and_writes_counted_separately(self):
+        self.assertIsNone(self.request('/projects/1/'))
+        self.assertIsNone(self.request('/projects/1/tickets/create', method='post'))
+        self.assertEqual(
+            self.request('/projects/1/tickets/create', method='post').status_code, 429)
+        self.assertIsNone(self.request('/projects/1/'))
+
+    def test_limited_per_client(self):
+        for _ in range(2):
+            self.request('/projects/')
+        self.assertEqual(self.request('/projects/').status_code, 429)
+        self.assertIsNone(self.request('/projects/', REMOTE_ADDR='10.0.0.2'))
+
+    def test_bucket_refills_gradually(self):
+        for _ in range(2):
+            self.assertIsNone(self.request('/projects/'))
+        self.assertEqual(self.request('/projects/').status_code, 429)
+
+        # wind the bucket back half a period, which is one token's worth
+        key = "ratelimit:read:project-list:ip-127.0.0.1"
+        tokens, counted_at = memcache.get(key)
+        memcache.set(key, (tokens, counted_at - 30))
+
+        self.assertIsNone(self.request('/projects/'))
+        self.assertEqual(self.request('/projects/').status_code, 429)
+
+    def test_unlimited(self):
+        for _ in range(5):
+            self.assertIsNone(self.request('/projects/1/updates'))
+
+    def test_task_queue_not_limited(self):
+        for _ in range(5):
+            self.assertIsNone(self.request('/projects/', HTTP_X_APPENGINE_QUEUENAME='default'))
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertIsNone(self.request('/projects/'))
@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.test.utils import override_settings
+
+from djangae.test import TestCase
+
+from .forms import TicketForm
+from .models import PendingAssignmentNotification, Project, Ticket
+from .notifications import LocalNotificationSender, send_assignment_notifications
+
+
+User = get_user_model()
+
+
+class FailingNotificationSender(object):
+    def send(self, user, ticket, assigned):
+        raise IOError("Mail is down")
+
+
+@override_settings(
+    ASSIGNMENT_NOTIFICATION_SENDER='tracker.site.notifications.LocalNotificationSender',
+    ASSIGNMENT_NOTIFICATION_DELAY=3600,
+    ASSIGNMENT_NOTIFICATION_QUEUE='default'
+)
+class AssignmentNotificationTest(TestCase):
+    def setUp(self):
+        super(AssignmentNotificationTest, self).setUp()
+        LocalNotificationSender.outbox = []
+
+        self.user1 = User.objects.create_user('first user', 'user1@example.com')
+        self.user2 = User.objects.create_user('second user', 'user2@example.com')
+
+        self.project = Project.objects.create(
+            title='Library Thinger',
+            created_by=self.user1
+        )
+
+        self.ticket = Ticket.objects.create(
+            title='task 1',
+            created_by=self.user1,
+            project=self.project,
+            assignees=[self.user1]
+        )
+
+    def assign(self, *users):
+        form = TicketForm(
+            project=self.project,
+            user=self.user1,
+            instance=Ticket.objects.get(pk=self.ticket.pk),
+            data={
+                'title': 'task 1',
+                'assignees': [u.pk for u in users]
+            }
+        )
+        self.assertTrue(form.is_valid())
+        form.save()
+
+    def test_unchanged_assignees_queue_nothing(self):
+        self.assign(self.user1)
+        self.assertNumTasksEquals(0)
+
+    def test_burst_of_edits_is_coalesced(self):
+        self.assign(self.user1, self.user2)
+        self.assign(self.user2)
+        self.assertNumTasksEquals(1)
+
+        self.process_task_queues()
+
+        self.assertItemsEqual(LocalNotificationSender.outbox, [
+            ('user1@example.com', self.ticket.pk, False),
+            ('user2@example.com', self.ticket.pk, True),
+        ])
+
+    def test_reverted_change_sends_nothing(self):
+        self.assign(self.user1, self.user2)
+        self.assign(self.user1)
+
+        self.process_task_queues()
+
+        self.assertEqual(LocalNotificationSender.outbox, [])
+
+    def test_retry_skips_users_already_notified(self):
+        self.assign(self.user2)
+
+        # as if the task failed after notifying user1
+        PendingAssignmentNotification.objects.filter(pk=self.ticket.pk).update(
+            assignee_ids=set())
+        send_assignment_notifications(self.ticket.pk)
+
+        self.assertEqual(LocalNotificationSender.outbox, [
+            ('user2@example.com', self.ticket.pk, True),
+        ])
+        self.assertFalse(PendingAssignmentNotification.objects.filter(pk=self.ticket.pk).exists())
+
+    def test_failed_send_is_retried(self):
+        self.assign(self.user2)
+
+        with override_settings(
+                ASSIGNMENT_NOTIFICATION_SENDER='tracker.site.test_notifications.FailingNotificationSender'):
+            with self.assertRaises(IOError):
+                send_assignment_notifications(self.ticket.pk)
+
+        pending = PendingAssignmentNotification.objects.get(pk=self.ticket.pk)
+        self.assertEqual(pending.assignee_ids, set([self.user1.pk]))
+
+        send_assignment_notifications(self.ticket.pk)
+
+        self.assertItemsEqual(LocalNotificationSender.outbox, [
+            ('user1@example.com', self.ticket.pk, False),
+            ('user2@example.com', self.ticket.pk, True),
+        ])
+
+    def test_edit_after_notifying_queues_again(self):
+        self.assign(self.user1, self.user2)
+        self.process_task_queues()
+
+        self.assign(self.user1)
+        self.assertNumTasksEquals(1)
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from .templatetags.static_bundles import static_bundle
+
+
+class StaticBundleTest(TestCase):
+    def setUp(self):
+        fd, self.manifest_path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'js/app.js': 'js/app-0123456789.js'}, f)
+
+    def tearDown(self):
+        os.remove(self.manifest_path)
+
+    def test_fingerprinted_name_used(self):
+        with override_settings(DEBUG=False, STATIC_URL='/static/',
+                               STATIC_MANIFEST=self.manifest_path):
+            self.assertEqual(static_bundle('js/app.js'), '/static/js/app-0123456789.js')
+
+    def test_unknown_bundle_falls_back(self):
+        with override_settings(DEBUG=False, STATIC_URL='/static/',
+                               STATIC_MANIFEST=self.manifest_path,
+                               STATIC_MANIFEST_REQUIRED=False):
+            self.assertEqual(static_bundle('js/other.js'), '/static/js/other.js')
+
+    def test_unknown_bundle_raises_when_required(self):
+        with override_settings(DEBUG=False, STATIC_URL='/static/',
+                               STATIC_MANIFEST=self.manifest_path,
+                               STATIC_MANIFEST_REQUIRED=True):
+            with self.assertRaises(ImproperlyConfigured):
+                static_bundle('js/other.js')
+
+        with override_settings(DEBUG=False, STATIC_URL='/static/',
+                               STATIC_MANIFEST=self.manifest_path + '.missing',
+                               STATIC_MANIFEST_REQUIRED=True):
+            with self.assertRaises(ImproperlyConfigured):
+                static_bundle('js/app.js')
+
+    def test_debug_ignores_manifest(self):
+        with override_settings(DEBUG=True, STATIC_URL='/static-dev/',
+                               STATIC_MANIFEST=self.manifest_path):
+            self.assertEqual(static_bundle('js/app.js'), '/static-dev/js/app.js')
@@ -1,19 +1,29 @@
+import json
+
 from django.contrib.auth import get_user_model
-from django.http import Http404
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, QueryDict
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.test.client import RequestFactory
 
-from .models import Project, Ticket
+from .models import Comment, Project, ProjectMembership, Ticket, UserProjectIndex, WorkloadRollup
 from .views import (
     project_list_view,
     create_project_view,
     update_project_view,
     project_view,
+    project_updates_view,
+    project_members_view,
+    remove_member_view,
 
     my_tickets_view,
+    workload_view,
     create_ticket_view,
     update_ticket_view,
     delete_ticket_view,
+    ticket_comments_view,
 )
 
 
@@ -49,10 +59,25 @@ class ProjectListViewTest(BaseTestCase):
         proj2 = Project.objects.create(title='Library Thinger', created_by=user)
 
         req = self.factory.get('/')
+        req.user = user
 
         resp = project_list_view(req)
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(list(resp.context_data['object_list']), [proj2, proj])
+        self.assertEqual(list(resp.context_data['object_list']), [proj, proj2])
+
+    def test_view_only_member_projects(self):
+        user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        other = User.objects.create_user('nice person', 'niceperson@example.com')
+        proj = Project.objects.create(title='Book Eater', created_by=user)
+        proj2 = Project.objects.create(title='Library Thinger', created_by=other)
+        Project.objects.create(title='Secret Thing', created_by=other)
+        ProjectMembership.objects.create(project=proj2, user=user)
+
+        req = self.factory.get('/')
+        req.user = user
+
+        resp = project_list_view(req)
+        self.assertEqual(list(resp.context_data['object_list']), [proj, proj2])
 
     def test_view_assigned_projects_come_first(self):
         user = User.objects.create_user('cool guy', 'coolguy@example.com')
@@ -68,6 +93,24 @@ class ProjectListViewTest(BaseTestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(list(resp.context_data['object_list']), [proj2, proj])
 
+    def test_ticket_count_stored(self):
+        user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        proj = Project.objects.create(title='Library Thinger', created_by=user)
+        stale = Project.objects.get(pk=proj.pk)
+
+        tickets = [Ticket.objects.create(title=str(i), project=proj) for i in range(2)]
+        tickets[0].delete()
+
+        # saving an instance loaded before the tickets leaves the count alone
+        stale.title = 'Book Eater'
+        stale.save()
+
+        req = self.factory.get('/')
+        req.user = user
+
+        resp = project_list_view(req)
+        self.assertEqual([p.ticket_count for p in resp.context_data['object_list']], [1])
+
 
 class ProjectCreateViewTest(BaseTestCase):
     def setUp(self):
@@ -121,6 +164,8 @@ class ProjectUpdateViewTest(BaseTestCase):
             title='Library Thinger',
             created_by=self.user
         )
+        ProjectMembership.objects.create(
+            project=self.project, user=self.user2, role=ProjectMembership.OWNER)
 
     def test_success(self):
         # test correctly updating a project
@@ -137,7 +182,7 @@ class ProjectUpdateViewTest(BaseTestCase):
         # assert that the object was changed
         p = Project.objects.get(pk=project_id)
         self.assertEqual(p.title, 'Burping Competition')
-        self.assertEqual(p.created_by, self.user2)
+        self.assertEqual(p.created_by, self.user)
 
     def test_no_title(self):
         project_id = self.project.pk
@@ -164,6 +209,18 @@ class ProjectUpdateViewTest(BaseTestCase):
         with self.assertRaises(AttributeError):
             update_project_view(req, project_id=project_id)
 
+    def test_member_cannot_edit(self):
+        member = User.objects.create_user('other person', 'otherperson@example.com')
+        ProjectMembership.objects.create(project=self.project, user=member)
+
+        req = self.factory.post('/', {'title': 'Burping Competition'})
+        req.user = member
+
+        with self.assertRaises(PermissionDenied):
+            update_project_view(req, project_id=self.project.pk)
+
+        self.assertEqual(Project.objects.get(pk=self.project.pk).title, 'Library Thinger')
+
 
 class ProjectViewTest(BaseTestCase):
     def setUp(self):
@@ -186,6 +243,109 @@ class ProjectViewTest(BaseTestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(self.project, resp.context_data['project'])
 
+    def test_closed_tickets_listed_separately(self):
+        open_ticket = Ticket.objects.create(
+            title='task 1', created_by=self.user, project=self.project)
+        closed_ticket = Ticket.objects.create(
+            title='task 2', created_by=self.user, project=self.project,
+            status=Ticket.CLOSED)
+
+        req = self.factory.get('/')
+        req.user = self.user
+        resp = project_view(req, project_id=self.project.pk)
+        self.assertEqual(list(resp.context_data['tickets']), [open_ticket])
+
+        req = self.factory.get('/', {'status': 'closed'})
+        req.user = self.user
+        resp = project_view(req, project_id=self.project.pk)
+        self.assertEqual(list(resp.context_data['tickets']), [closed_ticket])
+
+    def test_assigned_users(self):
+        other = User.objects.create_user('other guy', 'otherguy@example.com')
+        Ticket.objects.create(
+            title='task 1', created_by=self.user, project=self.project,
+            assignees=[self.user, other])
+
+        tickets, _ = self.get_tickets()
+        self.assertEqual(
+            set(tickets[0].assigned_users), set([self.user, other]))
+
+    def get_tickets(self, **params):
+        req = self.factory.get('/', params)
+        req.user = self.user
+        resp = project_view(req, project_id=self.project.pk)
+        return resp.context_data['tickets'], resp.context_data['next_page']
+
+    def test_sort_by_title(self):
+        b = Ticket.objects.create(title='b', created_by=self.user, project=self.project)
+        a = Ticket.objects.create(title='a', created_by=self.user, project=self.project)
+
+        tickets, _ = self.get_tickets(sort='title')
+        self.assertEqual(tickets, [a, b])
+
+        # an unknown sort falls back to the default, most recently modified first
+        tickets, _ = self.get_tickets(sort='description')
+        self.assertEqual(tickets, [a, b])
+
+    def test_filters(self):
+        other = User.objects.create_user('other guy', 'otherguy@example.com')
+
+        unassigned = Ticket.objects.create(
+            title='task 1', created_by=self.user, project=self.project)
+        assigned = Ticket.objects.create(
+            title='task 2', created_by=other, project=self.project)
+        assigned.assignees.add(self.user)
+        assigned.save()
+
+        tickets, _ = self.get_tickets(unassigned='1')
+        self.assertEqual(tickets, [unassigned])
+
+        tickets, _ = self.get_tickets(assignee=self.user.pk)
+        self.assertEqual(tickets, [assigned])
+
+        tickets, _ = self.get_tickets(created_by=other.pk)
+        self.assertEqual(tickets, [assigned])
+
+    @override_settings(TICKETS_PER_PAGE=1)
+    def test_cursor_paging(self):
+        for title in ('a', 'b', 'c'):
+            Ticket.objects.create(title=title, created_by=self.user, project=self.project)
+
+        titles = []
+        params = {'sort': 'title'}
+
+        while True:
+            tickets, next_page = self.get_tickets(**params)
+            titles.extend(ticket.title for ticket in tickets)
+            if not next_page:
+                break
+            params = dict(QueryDict(next_page.lstrip('?')).items())
+
+        self.assertEqual(titles, ['a', 'b', 'c'])
+
+    @override_settings(TICKETS_PER_PAGE=1)
+    def test_cursor_paging_through_ties(self):
+        tickets = [
+            Ticket.objects.create(title='same', created_by=self.user, project=self.project)
+            for _ in range(3)
+        ]
+
+        seen = []
+        params = {'sort': 'title'}
+
+        while True:
+            page, next_page = self.get_tickets(**params)
+            seen.extend(page)
+            if not next_page:
+                break
+            params = dict(QueryDict(next_page.lstrip('?')).items())
+
+        self.assertEqual(seen, sorted(tickets, key=lambda ticket: ticket.pk))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(Http404):
+            self.get_tickets(cursor='not a cursor')
+
     def test_project_not_found(self):
         project_id = self.project.pk
 
@@ -197,6 +357,86 @@ class ProjectViewTest(BaseTestCase):
         with self.assertRaises(Http404):
             project_view(req, project_id=project_id)
 
+    def test_anonymous_redirected_to_login(self):
+        req = self.factory.get('/')
+        req.user = AnonymousUser()
+
+        resp = project_view(req, project_id=self.project.pk)
+        self.assertEqual(resp.status_code, 302)
+
+    def test_not_a_member(self):
+        other = User.objects.create_user('nice person', 'niceperson@example.com')
+
+        req = self.factory.get('/')
+        req.user = other
+
+        with self.assertRaises(PermissionDenied):
+            project_view(req, project_id=self.project.pk)
+
+
+@override_settings(LIVE_POLL_TIMEOUT=0)
+class ProjectUpdatesViewTest(BaseTestCase):
+    def setUp(self):
+        super(ProjectUpdatesViewTest, self).setUp()
+
+        self.user = User.objects.create_user('cool guy', 'coolguy@example.com')
+
+        self.project = Project.objects.create(
+            title='Library Thinger',
+            created_by=self.user
+        )
+
+    def poll(self, since=None):
+        params = {} if since is None else {'since': since}
+        req = self.factory.get('/', params)
+        req.user = self.user
+
+        resp = project_updates_view(req, project_id=str(self.project.pk))
+        self.assertEqual(resp.status_code, 200)
+        return json.loads(resp.content)
+
+    def test_no_change(self):
+        version = self.poll()['version']
+
+        data = self.poll(since=version)
+        self.assertFalse(data['changed'])
+        self.assertEqual(data['version'], version)
+
+    def test_ticket_save_changes_version(self):
+        version = self.poll()['version']
+
+        Ticket.objects.create(
+            title='task 1',
+            created_by=self.user,
+            project=self.project
+        )
+
+        data = self.poll(since=version)
+        self.assertTrue(data['changed'])
+        self.assertNotEqual(data['version'], version)
+
+    def test_ticket_delete_changes_version(self):
+        ticket = Ticket.objects.create(
+            title='task 1',
+            created_by=self.user,
+            project=self.project
+        )
+        version = self.poll()['version']
+
+        ticket.delete()
+
+        self.assertTrue(self.poll(since=version)['changed'])
+
+    def test_members_only(self):
+        req = self.factory.get('/')
+        req.user = AnonymousUser()
+        resp = project_updates_view(req, project_id=str(self.project.pk))
+        self.assertEqual(resp.status_code, 302)
+
+        req.user = User.objects.create_user('nice person', 'niceperson@example.com')
+        with self.assertRaises(PermissionDenied):
+            project_updates_view(req, project_id=str(self.project.pk))
+
 
 class MyTicketsViewTest(BaseTestCase):
 
@@ -258,6 +498,19 @@ class MyTicketsViewTest(BaseTestCase):
         self.assertNotIn(self.ticket2, assigned_tickets)
         self.assertNotIn(self.ticket3, assigned_tickets)
 
+    def test_closed_tickets_hidden(self):
+        self.ticket2.status = Ticket.CLOSED
+        self.ticket2.save()
+
+        req = self.factory.get('/')
+        req.user = self.user1
+
+        resp = my_tickets_view(req)
+        assigned_tickets = resp.context_data['tickets']
+
+        self.assertIn(self.ticket1, assigned_tickets)
+        self.assertNotIn(self.ticket2, assigned_tickets)
+
     def test_user3_view(self):
         req = self.factory.get('/')
         req.user = self.user3
@@ -270,6 +523,79 @@ class MyTicketsViewTest(BaseTestCase):
         self.assertNotIn(self.ticket3, assigned_tickets)
 
 
+class WorkloadViewTest(BaseTestCase):
+    def setUp(self):
+        super(WorkloadViewTest, self).setUp()
+
+        self.user1 = User.objects.create_user('first user', 'user1@example.com')
+        self.user2 = User.objects.create_user('second user', 'user2@example.com')
+
+        self.project = Project.objects.create(
+            title='Library Thinger',
+            created_by=self.user1
+        )
+
+        self.ticket = Ticket.objects.create(
+            title='ticket 1',
+            project=self.project,
+            assignees=[self.user1, self.user2]
+        )
+        Ticket.objects.create(
+            title='ticket 2',
+            project=self.project,
+            assignees=[self.user1],
+            status=Ticket.IN_PROGRESS
+        )
+
+    def rollup_count(self, user, status):
+        try:
+            return WorkloadRollup.objects.get(
+                pk=WorkloadRollup.make_id(self.project.pk, user.pk, status)).count
+        except WorkloadRollup.DoesNotExist:
+            return 0
+
+    def test_rollups_follow_ticket_changes(self):
+        self.assertEqual(self.rollup_count(self.user1, Ticket.OPEN), 1)
+        self.assertEqual(self.rollup_count(self.user1, Ticket.IN_PROGRESS), 1)
+        self.assertEqual(self.rollup_count(self.user2, Ticket.OPEN), 1)
+
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        ticket.assignees = [self.user2]
+        ticket.status = Ticket.CLOSED
+        ticket.save()
+
+        self.assertEqual(self.rollup_count(self.user1, Ticket.OPEN), 0)
+        self.assertEqual(self.rollup_count(self.user2, Ticket.OPEN), 0)
+        self.assertEqual(self.rollup_count(self.user2, Ticket.CLOSED), 1)
+
+        ticket.delete()
+
+        self.assertEqual(self.rollup_count(self.user2, Ticket.CLOSED), 0)
+
+    def test_view(self):
+        req = self.factory.get('/')
+        req.user = self.user1
+
+        resp = workload_view(req)
+        workload = resp.context_data['workload']
+
+        self.assertEqual([row['user'] for row in workload], [self.user1, self.user2])
+        self.assertEqual(workload[0]['open'], 1)
+        self.assertEqual(workload[0]['in_progress'], 1)
+        self.assertEqual(workload[0]['projects'], {self.project: 2})
+
+    def test_only_member_projects(self):
+        other = User.objects.create_user('other person', 'otherperson@example.com')
+        other_project = Project.objects.create(title='Other Machine', created_by=other)
+        Ticket.objects.create(title='secret', project=other_project, assignees=[other])
+
+        req = self.factory.get('/')
+        req.user = self.user1
+
+        workload = workload_view(req).context_data['workload']
+        self.assertNotIn(other, [row['user'] for row in workload])
+
+
 class CreateTicketViewTest(BaseTestCase):
     def setUp(self):
         super(CreateTicketViewTest, self).setUp()
@@ -330,6 +656,8 @@ class UpdateTicketViewTest(BaseTestCase):
             created_by=self.user
         )
 
+        for project in (self.project, self.project2):
+            ProjectMembership.objects.create(project=project, user=self.user2)
 
         self.ticket = Ticket.objects.create(
             title='task 1',
@@ -383,19 +711,32 @@ class UpdateTicketViewTest(BaseTestCase):
         })
         req.user = self.user2
 
-        resp = update_ticket_view(req,
-                                  project_id=self.project2.pk,
-                                  ticket_id=self.ticket.pk)
+        # the ticket isn't found through another project, so
+        # update_ticket_view cannot be used to change its project
+        with self.assertRaises(Http404):
+            update_ticket_view(req,
+                               project_id=self.project2.pk,
+                               ticket_id=self.ticket.pk)
 
         new_ticket = Ticket.objects.get(pk=self.ticket.pk)
 
-        # this should fail, because update_ticket_view cannot
-        # be used to change the project for a ticket
-        self.assertEquals(resp.status_code, 200)
         self.assertEquals(new_ticket.title, 'task 1')
         self.assertEquals(new_ticket.description, '')
         self.assertEquals(new_ticket.created_by, self.user)
 
+    def test_ticket_from_other_project(self):
+        other = User.objects.create_user('other person', 'otherperson@example.com')
+        other_project = Project.objects.create(title='Other Machine', created_by=other)
+        ticket = Ticket.objects.create(
+            title='secret', description='not for you', created_by=other, project=other_project)
+
+        # user2 is a member of self.project, but not of other_project
+        req = self.factory.get('/')
+        req.user = self.user2
+
+        with self.assertRaises(Http404):
+            update_ticket_view(req, project_id=self.project.pk, ticket_id=ticket.pk)
+
 
 class DeleteTicketViewTest(BaseTestCase):
     def setUp(self):
@@ -438,3 +779,137 @@ class DeleteTicketViewTest(BaseTestCase):
             delete_ticket_view(req,
                                project_id=self.project.pk,
                                ticket_id=self.ticket.pk)
+
+
+    def test_ticket_from_other_project(self):
+        other = User.objects.create_user('other person', 'otherperson@example.com')
+        other_project = Project.objects.create(title='Other Machine', created_by=other)
+        ticket = Ticket.objects.create(title='secret', created_by=other, project=other_project)
+
+        req = self.factory.post('/')
+        req.user = self.user
+
+        with self.assertRaises(Http404):
+            delete_ticket_view(req, project_id=self.project.pk, ticket_id=ticket.pk)
+
+        self.assertTrue(Ticket.objects.filter(pk=ticket.pk).exists())
+
+
+class TicketCommentsViewTest(BaseTestCase):
+    def setUp(self):
+        super(TicketCommentsViewTest, self).setUp()
+
+        self.user = User.objects.create_user('cool guy', 'coolguy@example.com')
+        self.project = Project.objects.create(title='Library Thinger', created_by=self.user)
+        self.ticket = Ticket.objects.create(
+            title='task 1', created_by=self.user, project=self.project)
+
+    def get_comments(self, **params):
+        req = self.factory.get('/', params)
+        req.user = self.user
+        resp = ticket_comments_view(
+            req, project_id=self.project.pk, ticket_id=self.ticket.pk)
+        return resp.context_data['comments'], resp.context_data['next_page']
+
+    def test_add_comment(self):
+        req = self.factory.post('/', {'body': 'Looks *good*'})
+        req.user = self.user
+        resp = ticket_comments_view(
+            req, project_id=self.project.pk, ticket_id=self.ticket.pk)
+        self.assertEqual(resp.status_code, 302)
+
+        comment = Comment.objects.get()
+        self.assertEqual(comment.author, self.user)
+        self.assertEqual(comment.body_html, '<p>Looks <em>good</em></p>')
+
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        self.assertEqual(ticket.comment_count, 1)
+        self.assertEqual(ticket.last_comment_at, comment.created)
+
+    def test_stale_ticket_save_keeps_count(self):
+        stale = Ticket.objects.get(pk=self.ticket.pk)
+        Comment.objects.create(ticket=self.ticket, body='first')
+
+        stale.title = 'task 1 renamed'
+        stale.save()
+
+        ticket = Ticket.objects.get(pk=self.ticket.pk)
+        self.assertEqual(ticket.title, 'task 1 renamed')
+        self.assertEqual(ticket.comment_count, 1)
+
+    @override_settings(COMMENTS_PER_PAGE=1)
+    def test_newest_first_with_cursor(self):
+        first = Comment.objects.create(ticket=self.ticket, author=self.user, body='first')
+        second = Comment.objects.create(ticket=self.ticket, author=self.user, body='second')
+
+        comments, next_page = self.get_comments()
+        self.assertEqual(comments, [second])
+        self.assertEqual(comments[0].author_user, self.user)
+
+        comments, next_page = self.get_comments(**dict(QueryDict(next_page.lstrip('?')).items()))
+        self.assertEqual(comments, [first])
+        self.assertIsNone(next_page)
+
+    def test_ticket_from_other_project(self):
+        other = Project.objects.create(title='Book Eater', created_by=self.user)
+
+        req = self.factory.get('/')
+        req.user = self.user
+        with self.assertRaises(Http404):
+            ticket_comments_view(req, project_id=other.pk, ticket_id=self.ticket.pk)
+
+    def test_comments_deleted_with_ticket(self):
+        Comment.objects.create(ticket=self.ticket, author=self.user, body='first')
+
+        self.ticket.delete()
+        self.assertFalse(Comment.objects.exists())
+
+
+class ProjectMembersViewTest(BaseTestCase):
+    def setUp(self):
+        super(ProjectMembersViewTest, self).setUp()
+
+        self.owner = User.objects.create_user('cool guy', 'coolguy@example.com')
+        self.user = User.objects.create_user('nice person', 'niceperson@example.com')
+        self.project = Project.objects.create(title='Library Thinger', created_by=self.owner)
+
+    def add_member(self, user, email):
+        req = self.factory.post('/', {'email': email, 'role': ProjectMembership.MEMBER})
+        req.user = user
+        return project_members_view(req, project_id=self.project.pk)
+
+    def test_add_and_remove(self):
+        resp = self.add_member(self.owner, self.user.email)
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(UserProjectIndex.get_project_ids(self.user.pk), set([self.project.pk]))
+
+        req = self.factory.get('/')
+        req.user = self.user
+        resp = project_members_view(req, project_id=self.project.pk)
+        self.assertEqual(
+            [m.member for m in resp.context_data['memberships']], [self.owner, self.user])
+        self.assertFalse(resp.context_data['is_owner'])
+
+        req = self.factory.post('/')
+        req.user = self.owner
+        resp = remove_member_view(req, project_id=self.project.pk, user_id=self.user.pk)
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(UserProjectIndex.get_project_ids(self.user.pk), set())
+
+    def test_unknown_email(self):
+        resp = self.add_member(self.owner, 'nobody@example.com')
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(ProjectMembership.objects.filter(project=self.project, user=self.user).exists())
+
+    def test_member_cannot_add(self):
+        ProjectMembership.objects.create(project=self.project, user=self.user)
+        other = User.objects.create_user('other person', 'otherperson@example.com')
+
+        with self.assertRaises(PermissionDenied):
+            self.add_member(self.user, other.email)
+
+    def test_cannot_remove_creator(self):
+        req = self.factory.post('/')
+        req.user = self.owner
+        with self.assertRaises(PermissionDenied):
+            remove_member_view(req, project_id=self.project.pk, user_id=self.owner.pk)
@@ -1,14 +1,29 @@
 from django.conf.urls import url, patterns
 
+from .api import (
+    project_list_api_view,
+    project_api_view,
+    ticket_list_api_view,
+    ticket_api_view,
+    batch_api_view,
+)
+from .tasks import archive_tickets_task, reconcile_workload_task
 from .views import (
     my_tickets_view,
     create_project_view,
     update_project_view,
     project_view,
+    project_updates_view,
+    project_archive_view,
+    project_members_view,
+    remove_member_view,
     create_ticket_view,
     update_ticket_view,
     delete_ticket_view,
+    ticket_comments_view,
     project_list_view,
+    workload_view,
+    memory_profile_view,
 )
 
 
@@ -48,6 +63,35 @@ urlpatterns = patterns(
         name='ticket-delete'
     ),
 
+    url(
+        r'^projects/(?P<project_id>\d+)/tickets/(?P<ticket_id>\d+)/comments/$',
+        ticket_comments_view,
+        name='ticket-comments'
+    ),
+
+    url(
+        r'^projects/(?P<project_id>\d+)/archive/$',
+        project_archive_view,
+        name='project-archive'
+    ),
+
+    url(
+        r'^projects/(?P<project_id>\d+)/members/$',
+        project_members_view,
+        name='project-members'
+    ),
+    url(
+        r'^projects/(?P<project_id>\d+)/members/(?P<user_id>\d+)/remove$',
+        remove_member_view,
+        name='member-remove'
+    ),
+
+    url(
+        r'^projects/(?P<project_id>\d+)/updates$',
+        project_updates_view,
+        name='project-updates'
+    ),
+
     url(
         r'^projects/(?P<project_id>\d+)/$',
         project_view,
@@ -57,5 +101,54 @@ urlpatterns = patterns(
         r'^$',
         my_tickets_view,
         name='my-tickets'
+    ),
+
+    url(
+        r'^workload/$',
+        workload_view,
+        name='workload'
+    ),
+
+    url(
+        r'^memory-profile/$',
+        memory_profile_view,
+        name='memory-profile'
+    ),
+
+    url(
+        r'^api/projects/$',
+        project_list_api_view,
+        name='api-project-list'
+    ),
+    url(
+        r'^api/projects/(?P<project_id>\d+)/$',
+        project_api_view,
+        name='api-project'
+    ),
+    url(
+        r'^api/projects/(?P<project_id>\d+)/tickets/$',
+        ticket_list_api_view,
+        name='api-ticket-list'
+    ),
+    url(
+        r'^api/tickets/(?P<ticket_id>\d+)/$',
+        ticket_api_view,
+        name='api-ticket'
+    ),
+    url(
+        r'^api/batch$',
+        batch_api_view,
+        name='api-batch'
+    ),
+
+    url(
+        r'^tasks/archive-tickets/$',
+        archive_tickets_task,
+        name='task-archive-tickets'
+    ),
+    url(
+        r'^tasks/reconcile-workload/$',
+        reconcile_workload_task,
+        name='task-reconcile-workload'
     )
 )
@@ -1,20 +1,107 @@
+from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404
-from django.views.generic import TemplateView, CreateView, DeleteView, UpdateView, ListView
+from django.views.generic import View, TemplateView, CreateView, DeleteView, UpdateView, ListView
+from google.appengine.api import users
+
+from .async_fetch import fetch_async
+from .forms import CommentForm, MembershipForm, ProjectForm, TicketForm, TicketFilterForm
+from .live import get_project_version, wait_for_project_change
+from .memprofile import clear_profiles, get_profiles, tracemalloc
+from .models import (
+    ArchivedTicket,
+    Comment,
+    Project,
+    ProjectMembership,
+    Ticket,
+    UserProjectIndex,
+    WorkloadRollup,
+)
+from .paging import InvalidCursor, paginate
+
+
+def _change_query(params, **changes):
+    # changing the sort or filters starts again from the first page
+    params = params.copy()
+    params.pop('cursor', None)
+
+    for key, value in changes.items():
+        if value is None:
+            params.pop(key, None)
+        else:
+            params[key] = value
+
+    return "?" + params.urlencode()
+
+
+def _fetch_users(ids=None):
+    users = get_user_model().objects.all()
+    if ids is not None:
+        users = users.filter(pk__in=ids)
+    return list(users)
 
-from .forms import ProjectForm, TicketForm
-from .models import Project, Ticket
+
+def _assigned_project_ids(user_id):
+    return set(
+        rollup.project_id
+        for rollup in WorkloadRollup.objects.filter(assignee=user_id)
+        if rollup.count
+    )
 
 
 class ProjectContextMixin(object):
-    project = None
+    # Only members of the project get past dispatch(), and only owners if
+    # owner_required is set. Membership is checked against the user's
+    # UserProjectIndex, a get by key that runs alongside the project's.
+    # Views using it need login_required, so that anonymous users are sent
+    # to log in rather than refused.
+    project_future = None
+    project_ids_future = None
+    owner_required = False
+
+    def dispatch(self, request, *args, **kwargs):
+        self.check_access()
+        return super(ProjectContextMixin, self).dispatch(request, *args, **kwargs)
+
+    def get_project_async(self):
+        # starts fetching the project without waiting for it, so that views
+        # can start their other reads alongside it
+        if self.project_future is None:
+            self.project_future = fetch_async(
+                get_object_or_404, Project, pk=self.kwargs['project_id'])
+
+            user = getattr(self.request, 'user', None)
+            if user is not None and user.is_authenticated():
+                self.project_ids_future = fetch_async(UserProjectIndex.get_project_ids, user.pk)
+
+        return self.project_future
 
     def get_project(self):
-        if not self.project:
-            self.project = get_object_or_404(Project, pk=self.kwargs['project_id'])
+        return self.get_project_async().get_result()
+
+    def get_membership(self):
+        try:
+            return ProjectMembership.objects.get(
+                pk=ProjectMembership.make_id(self.kwargs['project_id'], self.request.user.pk))
+        except ProjectMembership.DoesNotExist:
+            return None
+
+    def check_access(self):
+        self.get_project_async()
+        if self.project_ids_future is None:
+            raise PermissionDenied
+
+        if int(self.kwargs['project_id']) not in self.project_ids_future.get_result():
+            raise PermissionDenied
 
-        return self.project
+        if self.owner_required:
+            membership = self.get_membership()
+            if membership is None or membership.role != ProjectMembership.OWNER:
+                raise PermissionDenied
 
     def get_context_data(self, **kwargs):
         context = super(ProjectContextMixin, self).get_context_data(**kwargs)
@@ -29,7 +116,7 @@ class MyTicketsView(TemplateView):
         if self.request.user.is_authenticated():
             tickets = (
                 Ticket.objects
-                .filter(assignees=self.request.user.pk)
+                .filter(assignees=self.request.user.pk, status__in=Ticket.ACTIVE_STATUSES)
                 .order_by('-modified')
             )
         else:
@@ -44,40 +131,104 @@ my_tickets_view = MyTicketsView.as_view()
 
 
 class ProjectListView(ListView):
+    # The projects the user is a member of, read with a get of their
+    # UserProjectIndex and a batch get of the projects in it
     model = Project
     template_name = "site/project_list.html"
+    context_object_name = "project_list"
+
+    def get_queryset(self):
+        user = getattr(self.request, 'user', None)
+        if user is None or not user.is_authenticated():
+            return []
+
+        assigned_future = fetch_async(_assigned_project_ids, user.pk)
+
+        project_ids = UserProjectIndex.get_project_ids(user.pk)
+        projects = Project.objects.in_bulk(list(project_ids)).values() if project_ids else []
+
+        # projects with tickets assigned to the user come first
+        assigned = assigned_future.get_result()
+        return sorted(projects, key=lambda p: (p.pk not in assigned, p.title.lower()))
+
+project_list_view = ProjectListView.as_view()
+
+
+class WorkloadView(TemplateView):
+    # Reads only the workload rollups, never the tickets themselves, and
+    # only those of the projects that the user is a member of
+    template_name = "site/workload.html"
+
+    # the most values the datastore allows in an IN filter
+    MAX_IN_VALUES = 30
+
+    def get_rollups(self):
+        project_ids = sorted(UserProjectIndex.get_project_ids(self.request.user.pk))
+
+        rollups = []
+        for start in range(0, len(project_ids), self.MAX_IN_VALUES):
+            # the status is filtered here, as a second IN filter would
+            # multiply the number of queries the datastore runs
+            rollups.extend(
+                rollup for rollup in WorkloadRollup.objects.filter(
+                    project__in=project_ids[start:start + self.MAX_IN_VALUES])
+                if rollup.status in Ticket.ACTIVE_STATUSES and rollup.count
+            )
+        return rollups
 
     def get_context_data(self, **kwargs):
-        context_data = super(ProjectListView, self).get_context_data(**kwargs)
+        context = super(WorkloadView, self).get_context_data(**kwargs)
+
+        rollups = self.get_rollups()
 
-        # only need to put projects that have tickets assigned to the user,
-        # if the user is logged in
-        if hasattr(self.request, 'user') and self.request.user.is_authenticated():
-            # the IDs of all of the tickets assigned to the user
-            user_ticket_ids = list(self.request.user.tickets.values_list('id', flat=True))
+        users = get_user_model().objects.in_bulk(set(r.assignee_id for r in rollups))
+        projects = Project.objects.in_bulk(set(r.project_id for r in rollups))
 
-            # projects with tickets assigned to the user
-            projects_for_user = []
+        workload = {}
+        for rollup in rollups:
+            row = workload.setdefault(rollup.assignee_id, {
+                'user': users.get(rollup.assignee_id),
+                'total': 0,
+                'projects': {},
+            })
+            row['total'] += rollup.count
+            row[rollup.status] = row.get(rollup.status, 0) + rollup.count
 
-            # projects with no tickets assigned to the user
-            projects_not_for_user = []
+            project = projects.get(rollup.project_id)
+            row['projects'][project] = row['projects'].get(project, 0) + rollup.count
 
-            for p in context_data['object_list']:
-                # filter tickets assigned to the user
-                assigned_tickets = p.tickets.filter(id__in=user_ticket_ids)
+        context['workload'] = sorted(
+            workload.values(), key=lambda row: row['total'], reverse=True)
+        return context
 
-                # if there are any such tickets
-                if assigned_tickets.exists():
-                    projects_for_user.append(p)
-                else:
-                    projects_not_for_user.append(p)
 
-            # put the projects with tickets assigned to the user first
-            context_data['object_list'] = projects_for_user + projects_not_for_user
+workload_view = login_required(WorkloadView.as_view())
 
-        return context_data
 
-project_list_view = ProjectListView.as_view()
+class MemoryProfileView(TemplateView):
+    # What MemoryProfileMiddleware has recorded, for App Engine admins only
+    template_name = "site/memory_profile.html"
+
+    def dispatch(self, request, *args, **kwargs):
+        if not users.is_current_user_admin():
+            raise PermissionDenied
+        return super(MemoryProfileView, self).dispatch(request, *args, **kwargs)
+
+    def post(self, request):
+        clear_profiles()
+        return HttpResponseRedirect(reverse("memory-profile"))
+
+    def get_context_data(self, **kwargs):
+        context = super(MemoryProfileView, self).get_context_data(**kwargs)
+        context.update({
+            "profiles": get_profiles(),
+            "enabled": settings.MEMORY_PROFILE_ENABLED and tracemalloc is not None,
+            "sample_rate": settings.MEMORY_PROFILE_SAMPLE_RATE,
+        })
+        return context
+
+
+memory_profile_view = MemoryProfileView.as_view()
 
 
 class CreateProjectView(CreateView):
@@ -103,6 +254,7 @@ class UpdateProjectView(ProjectContextMixin, UpdateView):
     form_class = ProjectForm
     pk_url_kwarg = 'project_id'
     template_name = "site/project_form.html"
+    owner_required = True
 
     def get_success_url(self):
         return reverse("project-list")
@@ -121,19 +273,239 @@ class ProjectView(ProjectContextMixin, TemplateView):
     template_name = "site/project_detail.html"
 
     def get_context_data(self, **kwargs):
+        # closed tickets are only fetched when asked for, so the default
+        # query only has to cover active work
+        filters = TicketFilterForm(self.request.GET)
+
+        # read before the tickets, so that a change made while they're
+        # being fetched bumps the version past this one and the page's
+        # long poll picks it up
+        version = get_project_version(self.kwargs['project_id'])
+
+        # the tickets are fetched by the project ID from the URL, so they
+        # are read at the same time as the project
+        self.get_project_async()
+        page = fetch_async(
+            paginate,
+            filters.filter(Ticket.objects.filter(project=self.kwargs['project_id'])),
+            filters.get_sort(),
+            cursor=filters.get('cursor'),
+            page_size=settings.TICKETS_PER_PAGE
+        )
+
         context = super(ProjectView, self).get_context_data(**kwargs)
         project = self.get_project()
+
+        try:
+            tickets, next_cursor = page.get_result()
+        except InvalidCursor:
+            raise Http404("Invalid cursor")
+
+        # one batch get for every assignee on the page, rather than
+        # a query per ticket in the template
+        assignee_ids = set()
+        for ticket in tickets:
+            assignee_ids.update(ticket.assignees_ids)
+
+        users = {}
+        if assignee_ids:
+            users = dict((user.pk, user) for user in _fetch_users(assignee_ids))
+
+        for ticket in tickets:
+            ticket.assigned_users = [users[pk] for pk in ticket.assignees_ids if pk in users]
+
+        params = self.request.GET
+        sort = filters.get_sort()
+        assignee = filters.get('assignee')
+        unassigned = filters.get('unassigned')
+
+        sort_options = [
+            (label, _change_query(params, sort=value), value == sort)
+            for value, label in TicketFilterForm.SORT_CHOICES
+        ]
+
+        assignee_options = [
+            ("Anyone", _change_query(params, assignee=None, unassigned=None),
+             not (assignee or unassigned)),
+            ("Unassigned", _change_query(params, assignee=None, unassigned='1'),
+             bool(unassigned)),
+        ]
+
+        user = getattr(self.request, 'user', None)
+        if user and user.is_authenticated():
+            assignee_options.insert(1, (
+                "Assigned to me",
+                _change_query(params, assignee=str(user.pk), unassigned=None),
+                assignee == user.pk and not unassigned
+            ))
+            created_by_me = filters.get('created_by') == user.pk
+            assignee_options.append((
+                "Created by me",
+                _change_query(params, created_by=None if created_by_me else str(user.pk)),
+                created_by_me
+            ))
+
+        next_page = None
+        if next_cursor:
+            next_page = params.copy()
+            next_page['cursor'] = next_cursor
+            next_page = "?" + next_page.urlencode()
+
         context.update({
             "project": project,
-            "tickets": project.tickets.all()
+            "tickets": tickets,
+            "sort_options": sort_options,
+            "assignee_options": assignee_options,
+            "show_closed": filters.get('status') == Ticket.CLOSED,
+            "next_page": next_page,
+            "version": version
+        })
+        return context
+
+
+project_view = login_required(ProjectView.as_view())
+
+
+class ProjectArchiveView(ProjectContextMixin, ListView):
+    template_name = "site/project_archive.html"
+    context_object_name = "tickets"
+    paginate_by = 50
+
+    def get_queryset(self):
+        return ArchivedTicket.objects.filter(project=self.get_project())
+
+    def get_context_data(self, **kwargs):
+        context = super(ProjectArchiveView, self).get_context_data(**kwargs)
+        context['project'] = self.get_project()
+        return context
+
+
+project_archive_view = login_required(ProjectArchiveView.as_view())
+
+
+class ProjectUpdatesView(ProjectContextMixin, View):
+    # Long-poll endpoint for the project page. Only members can poll, which
+    # is checked once up front. While waiting it only reads the memcache
+    # version.
+
+    def get(self, request, project_id):
+        try:
+            since = int(request.GET['since'])
+        except (KeyError, ValueError):
+            since = None
+
+        version = wait_for_project_change(project_id, since)
+
+        return JsonResponse({
+            "version": version,
+            "changed": version != since
+        })
+
+
+project_updates_view = login_required(ProjectUpdatesView.as_view())
+
+
+class ProjectMembersView(ProjectContextMixin, CreateView):
+    # Lists the project's members. Owners can add members here, and remove
+    # them with RemoveMemberView.
+    model = ProjectMembership
+    form_class = MembershipForm
+    template_name = "site/project_members.html"
+
+    def post(self, request, *args, **kwargs):
+        if not self.is_owner():
+            raise PermissionDenied
+        return super(ProjectMembersView, self).post(request, *args, **kwargs)
+
+    def is_owner(self):
+        if not hasattr(self, '_membership'):
+            self._membership = self.get_membership()
+        return self._membership is not None and self._membership.role == ProjectMembership.OWNER
+
+    def get_success_url(self):
+        return reverse("project-members", kwargs={"project_id": self.kwargs['project_id']})
+
+    def get_form_kwargs(self):
+        kwargs = super(ProjectMembersView, self).get_form_kwargs()
+        kwargs['project'] = self.get_project()
+        kwargs['user'] = self.request.user
+        kwargs['title'] = 'Add member'
+        return kwargs
+
+    def get_context_data(self, **kwargs):
+        context = super(ProjectMembersView, self).get_context_data(**kwargs)
+
+        memberships = list(ProjectMembership.objects.filter(project=self.kwargs['project_id']))
+        users = {}
+        if memberships:
+            users = dict(
+                (user.pk, user)
+                for user in _fetch_users(set(m.user_id for m in memberships))
+            )
+
+        for membership in memberships:
+            membership.member = users.get(membership.user_id)
+
+        memberships.sort(key=lambda m: (
+            m.role != ProjectMembership.OWNER, m.member.email if m.member else ''))
+
+        context.update({
+            "project": self.get_project(),
+            "memberships": memberships,
+            "is_owner": self.is_owner(),
         })
         return context
 
 
-project_view = ProjectView.as_view()
+project_members_view = login_required(ProjectMembersView.as_view())
+
 
+class RemoveMemberView(ProjectContextMixin, View):
+    owner_required = True
+    http_method_names = ['post']
 
-class CreateTicketView(ProjectContextMixin, CreateView):
+    def post(self, request, project_id, user_id):
+        project = self.get_project()
+
+        # the project's creator always stays an owner
+        if int(user_id) == project.created_by_id:
+            raise PermissionDenied
+
+        membership = get_object_or_404(
+            ProjectMembership, pk=ProjectMembership.make_id(project.pk, user_id))
+        membership.delete()
+
+        return HttpResponseRedirect(
+            reverse("project-members", kwargs={"project_id": project.pk}))
+
+
+remove_member_view = login_required(RemoveMemberView.as_view())
+
+
+class ProjectTicketMixin(object):
+    # Tickets are only found in the project from the URL, which is the one
+    # that ProjectContextMixin checked the user is a member of
+    def get_queryset(self):
+        return Ticket.objects.filter(project=self.kwargs['project_id'])
+
+
+class TicketFormMixin(ProjectContextMixin):
+    """ Fetches the project and the candidate assignees together """
+
+    def dispatch(self, request, *args, **kwargs):
+        self.get_project_async()
+        self.candidates_future = fetch_async(_fetch_users)
+        return super(TicketFormMixin, self).dispatch(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        kwargs = super(TicketFormMixin, self).get_form_kwargs()
+        kwargs['project'] = self.get_project()
+        kwargs['candidates'] = self.candidates_future.get_result()
+        kwargs['user'] = self.request.user
+        return kwargs
+
+
+class CreateTicketView(TicketFormMixin, CreateView):
     model = Ticket
     form_class = TicketForm
     template_name = "site/ticket_form.html"
@@ -143,8 +515,6 @@ class CreateTicketView(ProjectContextMixin, CreateView):
 
     def get_form_kwargs(self):
         kwargs = super(CreateTicketView, self).get_form_kwargs()
-        kwargs['project'] = self.get_project()
-        kwargs['user'] = self.request.user
         kwargs['title'] = 'Create ticket'
         return kwargs
 
@@ -152,7 +522,7 @@ class CreateTicketView(ProjectContextMixin, CreateView):
 create_ticket_view = login_required(CreateTicketView.as_view())
 
 
-class UpdateTicketView(ProjectContextMixin, UpdateView):
+class UpdateTicketView(ProjectTicketMixin, TicketFormMixin, UpdateView):
     model = Ticket
     form_class = TicketForm
     pk_url_kwarg = 'ticket_id'
@@ -163,8 +533,6 @@ class UpdateTicketView(ProjectContextMixin, UpdateView):
 
     def get_form_kwargs(self):
         kwargs = super(UpdateTicketView, self).get_form_kwargs()
-        kwargs['project'] = self.get_project()
-        kwargs['user'] = self.request.user
         kwargs['title'] = "Edit {0}".format(self.object.title)
         return kwargs
 
@@ -172,7 +540,66 @@ class UpdateTicketView(ProjectContextMixin, UpdateView):
 update_ticket_view = login_required(UpdateTicketView.as_view())
 
 
-class DeleteTicketView(ProjectContextMixin, DeleteView):
+class TicketCommentsView(ProjectContextMixin, CreateView):
+    # The ticket's comments, newest first, and a form to add one
+    model = Comment
+    form_class = CommentForm
+    template_name = "site/ticket_comments.html"
+    ticket = None
+
+    def get_ticket(self):
+        if self.ticket is None:
+            self.ticket = get_object_or_404(
+                Ticket, pk=self.kwargs['ticket_id'], project=self.kwargs['project_id'])
+
+        return self.ticket
+
+    def get_success_url(self):
+        return reverse("ticket-comments", kwargs={
+            "project_id": self.kwargs['project_id'],
+            "ticket_id": self.kwargs['ticket_id']
+        })
+
+    def get_form_kwargs(self):
+        kwargs = super(TicketCommentsView, self).get_form_kwargs()
+        kwargs['ticket'] = self.get_ticket()
+        kwargs['user'] = self.request.user
+        return kwargs
+
+    def get_context_data(self, **kwargs):
+        context = super(TicketCommentsView, self).get_context_data(**kwargs)
+        ticket = self.get_ticket()
+
+        try:
+            comments, next_cursor = paginate(
+                ticket.comments.all(), '-created',
+                cursor=self.request.GET.get('cursor'),
+                page_size=settings.COMMENTS_PER_PAGE
+            )
+        except InvalidCursor:
+            raise Http404("Invalid cursor")
+
+        author_ids = set(comment.author_id for comment in comments if comment.author_id)
+        users = {}
+        if author_ids:
+            users = dict((user.pk, user) for user in _fetch_users(author_ids))
+
+        for comment in comments:
+            comment.author_user = users.get(comment.author_id)
+
+        context.update({
+            "project": self.get_project(),
+            "ticket": ticket,
+            "comments": comments,
+            "next_page": "?cursor={0}".format(next_cursor) if next_cursor else None,
+        })
+        return context
+
+
+ticket_comments_view = login_required(TicketCommentsView.as_view())
+
+
+class DeleteTicketView(ProjectTicketMixin, ProjectContextMixin, DeleteView):
     model = Ticket
     pk_url_kwarg = 'ticket_id'
 
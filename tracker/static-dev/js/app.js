@@ -1,2 +1,30 @@
 $(document).foundation();
-$('.selectmultiple').chosen();
+
+// Long-poll for changes to the project being viewed and reload once
+// someone else has edited it
+(function () {
+	var $live = $('[data-updates-url]');
+
+	if (!$live.length) {
+		return;
+	}
+
+	var url = $live.data('updates-url');
+	var version = $live.data('version');
+
+	function poll() {
+		$.getJSON(url, {since: version})
+			.done(function (data) {
+				if (data.changed) {
+					window.location.reload();
+				} else {
+					poll();
+				}
+			})
+			.fail(function () {
+				setTimeout(poll, 5000);
+			});
+	}
+
+	poll();
+})();
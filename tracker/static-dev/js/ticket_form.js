@@ -0,0 +1 @@
+$('.selectmultiple').chosen();
@@ -3,17 +3,25 @@ from django.conf.urls import patterns, include, url
 import session_csrf
 session_csrf.monkeypatch()
 
-from django.contrib import admin
-admin.autodiscover()
+from tracker.lazy_urls import lazy_include
+
+
+def admin_urls():
+    # INSTALLED_APPS has the admin's SimpleAdminConfig, so the admin
+    # modules of every app are only imported once the admin is used
+    from django.contrib import admin
+    admin.autodiscover()
+    return admin.site.get_urls()
+
 
 urlpatterns = patterns('',
     # Examples:
     url(r'^_ah/', include('djangae.urls')),
 
     # Note that by default this is also locked down with login:admin in app.yaml
-    url(r'^admin/', include(admin.site.urls)),
+    lazy_include(r'^admin/', admin_urls, app_name='admin', namespace='admin'),
 
-    url(r'^csp/', include('cspreports.urls')),
+    lazy_include(r'^csp/', 'cspreports.urls'),
 
     url(r'', include('djangae.contrib.gauth.urls')),
     url(r'', include('tracker.site.urls')),